@@ -1,90 +1,63 @@
 import turtle as T
-import math
-import random
+from orbit_engine import OrbitEngine
+from labels import Label
+from starfield import draw_star_field
+from orbits import OrbitGuide
+from clock import FixedStepClock, FrameScheduler
+from scenes import FINAL_PLANETS, FINAL_SCENE
+from profiling import PhaseTimer, StatsHUD
+from snapshot import Timeline, nest, section
+from recording import from_argv
+from layers import LayerStack
 
 # --- Setup screen ---
 screen = T.Screen()
 screen.bgcolor("black")
 screen.title("Solar System Simulation")
 screen.tracer(False)  # Manual update for smooth animation
+canvas = screen.getcanvas()
 
-# --- Draw stars (background space) ---
-def draw_stars(n=3000):
-    star = T.Turtle(visible=False)
-    star.hideturtle()
-    star.speed(0)
-    star.color("white")
-    star.penup()
-    for _ in range(n):
-        x = random.randint(-800, 800)
-        y = random.randint(-500, 500)
-        star.goto(x, y)
-        size = random.choice([1, 2, 3])
-        star.dot(size)
+# --- Scene layers: static ones are built once, dynamic ones redrawn when dirty ---
+layers = LayerStack(screen)
 
-draw_stars()
+# --- Draw stars (background space) ---
+def draw_stars(n=FINAL_SCENE["stars"]["count"]):
+    # Baked once into a cached image and shown as a single canvas item
+    stars = FINAL_SCENE["stars"]
+    return [draw_star_field(screen, n, width=stars["width"], height=stars["height"],
+                            seed=stars["seed"], sizes=stars["sizes"])]
 
 # --- Draw Small Sun with Glow ---
 def draw_sun():
-    sun = T.Turtle(visible=False)
-    sun.hideturtle()
-    sun.speed(0)
-
-    # Small glow layers (soft effect)
-    for r in range(35, 20, -3):  # glow outside the core
-        sun.penup()
-        sun.goto(0, -r)
-        sun.pendown()
-        sun.color("gold")
-        sun.begin_fill()
-        sun.circle(r)
-        sun.end_fill()
-
-    # Core of the Sun
-    core_radius = 18
-    sun.penup()
-    sun.goto(0, -core_radius)
-    sun.pendown()
-    sun.color("yellow")
-    sun.begin_fill()
-    sun.circle(core_radius)
-    sun.end_fill()
-
-draw_sun()  # ✅ Call it so the sun actually shows up
+    # Glow discs outside the core, then the core (FINAL_SCENE["sun"])
+    return [canvas.create_oval(-r, -r, r, r, fill=color if filled else "",
+                               outline=color, width=width)
+            for r, color, filled, width in FINAL_SCENE["sun"]]
 
 # --- Function to draw ellipse ---
 def draw_ellipse(a, b, color="white"):
-    t = T.Turtle(visible=False)
-    t.hideturtle()
-    t.speed(0)
-    t.color(color)
-    t.penup()
-    points = []
-    for angle in range(360):
-        x = a * math.cos(math.radians(angle))
-        y = b * math.sin(math.radians(angle))
-        points.append((x, y))
-    t.goto(points[0])
-    t.pendown()
-    for x, y in points:
-        t.goto(x, y)
+    # Cached path, drawn as a single canvas line
+    return OrbitGuide(screen, a, b, color=color)
 
 # --- Draw all orbits ---
 def draw_all_orbits():
-    orbits = [
-        (120, 75),   # Mercury
-        (180, 120),  # Venus
-        (240, 165),  # Earth
-        (300, 210),  # Mars
-        (375, 255),  # Jupiter
-        (450, 315),  # Saturn
-        (525, 375),  # Uranus
-        (615, 435)   # Neptune
-    ]
-    for a, b in orbits:
-        draw_ellipse(a, b, color="white")
-
-draw_all_orbits()
+    orbits = [(row[2], row[3]) for row in FINAL_PLANETS]  # (a, b) per planet
+    return [draw_ellipse(a, b, color=FINAL_SCENE["orbit_color"]) for a, b in orbits]
+
+layers.add("stars", build=draw_stars)
+layers.add("sun", build=draw_sun)
+layers.add("orbits", build=lambda: [guide.item for guide in draw_all_orbits()])
+
+# --- Orbit engine (positions for all planets in one batched step) ---
+engine = OrbitEngine()
+
+# --- Planet info panel (text only re-rendered when a value changes) ---
+INFO_TEMPLATE = ("{}\n"
+                 "Diameter: {} km\n"
+                 "Mass: {:.2e} kg\n"
+                 "Density: {} g/cm³\n"
+                 "Dist from Earth: {}M km\n"
+                 "Speed: {:.2f}°/step")
 
 # --- Planet class ---
 class Planet:
@@ -92,11 +65,9 @@ class Planet:
                  density_g_cm3, mass_kg, distance_million_km):
         self.name = name
         self.color = color
-        self.a = a  # semi-major axis
-        self.b = b  # semi-minor axis
         self.size = size
-        self.speed = speed
-        self.angle = 0
+        # Orbit state lives in the engine arrays
+        self.index = engine.add_body(a, b, speed=speed)
 
         # Physical properties
         self.diameter_km = diameter_km
@@ -111,92 +82,59 @@ class Planet:
         self.t.shapesize(stretch_wid=size, stretch_len=size)
         self.t.penup()
 
-        # Label turtle for planet info
-        self.label = T.Turtle(visible=False)
-        self.label.hideturtle()
-        self.label.color("white")
-        self.label.penup()
-
-    def move(self):
-        # Update angle
-        self.angle = (self.angle + self.speed) % 360
-        rad = math.radians(self.angle)
-        x = self.a * math.cos(rad)
-        y = self.b * math.sin(rad)
+        # Label for planet info (one canvas text item, moved each frame)
+        self.label = Label(screen, INFO_TEMPLATE, align="center",
+                           font=("Arial", 10, "normal"), color="white")
+
+    @property
+    def speed(self):
+        return engine.speed[self.index]
+
+    def move(self, x, y):
+        # Position comes from the engine's position arrays
         self.t.goto(x, y)
 
-        # Clear previous info and write new
-        self.label.clear()
-        info_text = f"{self.name}\n" \
-                    f"Diameter: {self.diameter_km} km\n" \
-                    f"Mass: {self.mass_kg:.2e} kg\n" \
-                    f"Density: {self.density} g/cm³\n" \
-                    f"Dist from Earth: {self.distance_million_km}M km\n" \
-                    f"Speed: {self.speed:.2f}°/step"
-        self.label.goto(x, y + 15)  # Display above planet
-        self.label.write(info_text, align="center",
-                         font=("Arial", 10, "normal"))
+    def show_info(self, x, y):
+        # Display above planet; text is only rebuilt when a value changes
+        self.label.place(x, y + 15, self.name, self.diameter_km, self.mass_kg,
+                         self.density, self.distance_million_km, self.speed)
 
 # --- Create planets ---
-planets = [
-    Planet("Mercury", "gray", 120, 75, 0.4, 4.7*2, 4880, 5.43, 3.3e23, 91),
-    Planet("Venus", "orange", 180, 120, 0.6, 3.5*2, 12104, 5.24, 4.87e24, 41),
-    Planet("Earth", "blue", 240, 165, 0.7, 3.0*2, 12742, 5.52, 5.97e24, 0),
-    Planet("Mars", "red", 300, 210, 0.5, 2.4*2, 6779, 3.93, 0.642e24, 78),
-    Planet("Jupiter", "brown", 375, 255, 1.5, 1.3*2, 139820, 1.33, 1898e24, 628),
-    Planet("Saturn", "gold", 450, 315, 1.2, 1.0*2, 116460, 0.69, 568e24, 1275),
-    Planet("Uranus", "lightblue", 525, 375, 1.0, 0.7*2, 50724, 1.27, 86.8e24, 2720),
-    Planet("Neptune", "purple", 615, 435, 1.0, 0.5*2, 49244, 1.64, 102e24, 4350)
-]
+planets = [Planet(*row) for row in FINAL_PLANETS]  # table in scenes.py
 
 # --- Instructions in a box ---
-instr_turtle = T.Turtle(visible=False)
-instr_turtle.hideturtle()
-instr_turtle.penup()
-instr_turtle.color("white")
-show_instr = True  # Start by showing instructions
+instructions_text = (
+    "                                  Instruction Controls:\n"
+    "(+)  Click SPACE: Pause / Resume\n"
+    "(+)  Click ' i ' : show or not show instruction\n"
+    "(+)  Click UP Arrow or '+': Increase speed of all planets\n"
+    "(+)  Click DOWN Arrow or '-': Decrease speed of all planets\n"
+    "(+)  Click ' h ' / ' p ': timing overlay / save timing stats\n"
+    "(+)  Click F5 / F9: save / load a snapshot\n"
+    "(+)  Click ' [ ' / ' ] ': jump back / forward one minute\n"
+)
 
 def show_instructions():
-    instr_turtle.clear()
-    if show_instr:
-        # Draw box
-        x_left, y_top = -300, -100
-        width, height = 620, 150
-        instr_turtle.goto(x_left, y_top)
-        instr_turtle.pendown()
-        instr_turtle.pensize(10)
-        instr_turtle.fillcolor("gray")
-        instr_turtle.begin_fill()
-        
-        for _ in range(2):
-            instr_turtle.forward(width)
-            instr_turtle.right(90)
-            instr_turtle.forward(height)
-            instr_turtle.right(90)
-        instr_turtle.end_fill()
-        instr_turtle.penup()
-
-        # Write instructions inside box
-        instr_turtle.goto(0, -250)
-        instructions_text = (
-            "                                  Instruction Controls:\n"
-            "(+)  Click SPACE: Pause / Resume\n"
-            "(+)  Click ' i ' : show or not show instruction\n"
-            "(+)  Click UP Arrow or '+': Increase speed of all planets\n"
-            "(+)  Click DOWN Arrow or '-': Decrease speed of all planets\n" 
-        )
-        instr_turtle.write(instructions_text, align="center", font=("Arial", 16, "bold"))
+    # Built once; 'i' only flips the layer's visibility
+    x_left, y_top = -300, -25
+    width, height = 620, 225
+    box = canvas.create_rectangle(x_left, -y_top, x_left + width, -y_top + height,
+                                  fill="gray", outline="white", width=10)
+    text = canvas.create_text(-1, 250, text=instructions_text, anchor="s",
+                              fill="white", font=("Arial", 16, "bold"))
+    return [box, text]
+
+layers.add("instructions", build=show_instructions, above=True)  # start by showing them
 
 def toggle_instructions():
-    global show_instr
-    show_instr = not show_instr
-    show_instructions()
+    layers["instructions"].toggle()
 
 # --- Animation loop with pause/resume ---
 paused = False  # global flag
 def toggle_pause():
     global paused
     paused = not paused
+    record_controls()
     if paused:
         print("Paused")
     else:
@@ -204,14 +142,31 @@ def toggle_pause():
 
 # --- Functions to adjust ALL planets ---
 def speed_up_all():
-    for p in planets:
-        p.speed *= 1.2
+    engine.speed *= 1.2
+    record_controls()
     print("All planets sped up")
 def slow_down_all():
-    for p in planets:
-        p.speed *= 0.8
+    engine.speed *= 0.8
+    record_controls()
     print("All planets slowed down")
 
+# --- Record / replay (python Final_project.py --record run.rec | --replay run.rec) ---
+recorder, player = from_argv()
+
+def record_controls():
+    if recorder is not None:
+        recorder.event("paused", paused)
+        recorder.event("speeds", engine.speed.tolist())
+
+def replay_event(name, value):
+    global paused
+    if name == "paused":
+        paused = value
+    elif name == "speeds":
+        engine.speed[:] = value  # the info labels show the recorded speeds
+
+record_controls()
+
 # --- Key bindings ---
 screen.listen()
 screen.onkey(toggle_pause, "space")
@@ -220,13 +175,85 @@ screen.onkey(speed_up_all, "Up")   # Press ↑ arrow
 screen.onkey(speed_up_all, "+")    # Press + key
 screen.onkey(slow_down_all, "Down") # Press ↓ arrow
 screen.onkey(slow_down_all, "-")    # Press - key
+screen.onkey(lambda: hud.toggle(), "h")  # Press 'h' for the timing overlay
+screen.onkey(lambda: hud.dump(), "p")    # Press 'p' to save timing stats
+screen.onkey(lambda: timeline.save(), "F5")  # Press F5 to save a snapshot
+screen.onkey(lambda: timeline.load(), "F9")  # Press F9 to load it back
+screen.onkey(lambda: timeline.seek_seconds(-60), "bracketleft")   # '[' one minute back
+screen.onkey(lambda: timeline.seek_seconds(60), "bracketright")   # ']' one minute on
+if player is not None:  # replaying: the keys drive the playback instead
+    screen.onkey(player.toggle_pause, "space")
+    screen.onkey(lambda: player.set_speed(player.speed * 2), "Up")
+    screen.onkey(lambda: player.set_speed(player.speed / 2), "Down")
+    screen.onkey(lambda: player.seek(player.t - 10), "bracketleft")
+    screen.onkey(lambda: player.seek(player.t + 10), "bracketright")
 
-def animate():
+# --- Fixed physics timestep: one planet step every 30 ms of real time ---
+clock = FixedStepClock(step=FINAL_SCENE["step"], max_steps=5)
+TARGET_FPS = 60
+scheduler = FrameScheduler(TARGET_FPS)  # frames on absolute deadlines
+frame_timer = PhaseTimer(target_ms=1000 / TARGET_FPS)  # per-phase frame timings
+hud = StatsHUD(screen, frame_timer)       # live overlay, toggled with 'h'
+
+# --- Snapshots: the engine arrays are the whole simulation state ---
+def advance_headless(n):
+    for _ in range(n):
+        engine.step()
+
+# --- Moving bodies: a dynamic layer, redrawn only when there is a new frame ---
+frame_xy = None  # positions for the next draw
+
+def draw_bodies():
+    xs, ys = frame_xy
     for planet in planets:
-        if not paused:
-            planet.move()
-    screen.update()
-    screen.ontimer(animate, 30)  # ~33 FPS
+        planet.move(xs[planet.index], ys[planet.index])
+    frame_timer.lap("bodies")
+    for planet in planets:
+        planet.show_info(xs[planet.index], ys[planet.index])
+    frame_timer.lap("labels")
+
+layers.add("bodies", draw=draw_bodies)
+layers["bodies"].dirty = False  # nothing to draw before the first frame
+layers.compose()  # build the static layers now
+
+timeline = Timeline(clock,
+                    capture=lambda: nest("engine", engine.get_state()),
+                    restore=lambda state: engine.set_state(section(state, "engine")),
+                    advance=advance_headless,
+                    path="snapshot_final.bin",
+                    every=1000)  # a checkpoint every 30 s of simulated time
+
+def animate():
+    global frame_xy
+    frame_timer.begin()
+    xs = ys = None
+    if player is not None:
+        frame = player.poll(replay_event)  # recorded positions, no physics
+        if frame is not None:
+            xs, ys = frame.x, frame.y
+    elif paused:
+        clock.reset()
+    else:
+        for _ in range(clock.advance()):
+            engine.step()
+        timeline.record()
+        # Render between the last two physics states
+        xs, ys = engine.evaluate(alpha=clock.alpha)
+        if recorder is not None:
+            recorder.frame(xs, ys)
+    frame_timer.lap("physics")
+    if xs is not None:
+        frame_xy = (xs, ys)
+        layers["bodies"].mark_dirty()
+    if scheduler.render:  # skipped while catching up; dirty layers wait
+        layers.compose()
+    hud.update()
+    frame_timer.lap("hud")
+    if scheduler.render:
+        screen.update()
+    frame_timer.lap("update")
+    frame_timer.end()
+    screen.ontimer(animate, scheduler.frame_done())  # next deadline
 
 animate()
 screen.mainloop()
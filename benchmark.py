@@ -0,0 +1,133 @@
+"""
+Benchmark
+---------
+Headless frame-cost benchmark for all three simulations.
+
+Each script is executed on a stub canvas (headless.py), extra bodies are
+added through the script's own constructors, and its frame function
+(`animate()` / `update_simulation()`) is driven for a fixed number of
+frames. The physics clock is replaced by a fake one that advances exactly
+one physics step per frame, so runs are reproducible.
+
+Reported per body count: mean ms per frame for each phase recorded by
+the script's `frame_timer` (physics, stars, trails, bodies, labels,
+rings, update, ...) and canvas calls per frame.
+
+Usage:
+    python benchmark.py --frames 200 --bodies 0 100 1000 --json results.json
+"""
+import argparse
+import json
+import os
+import runpy
+import sys
+import time
+
+import numpy as np
+
+import headless
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# ---------- Extra bodies, added with each script's own code ----------
+def add_final(ns, rng, n):
+    for i in range(n):
+        a = rng.uniform(100, 650)
+        ns["planets"].append(ns["Planet"](f"A{i}", "gray", a, a * rng.uniform(0.6, 0.9),
+                                          0.2, rng.uniform(0.5, 5), 500, 2.0, 1e20, 100))
+
+
+def add_projects(ns, rng, n):
+    for i in range(n):
+        ns["add_planet"](f"A{i}", "gray", rng.uniform(160, 420), rng.uniform(1, 5),
+                         500, 400000000, 18.0)
+
+
+def add_mini(ns, rng, n):
+    for i in range(n):
+        a = rng.uniform(60, 330)
+        ns["planets"].append(ns["Planet"](f"A{i}", "#888888", 4, orbit_a=a,
+                                          orbit_b=a * rng.uniform(0.8, 1.0),
+                                          speed_deg=rng.uniform(0.5, 4),
+                                          tilt=rng.uniform(-20, 20)))
+
+
+SCRIPTS = {
+    "final": ("Final_project.py", "animate", add_final),
+    "projects": ("projects.py", "update_simulation", add_projects),
+    "mini": ("solar_system_turtle.py", "animate", add_mini),
+}
+
+
+def run_script(name, bodies, frames, seed=0, renderer=None):
+    """Return (phase ms/frame dict, canvas calls/frame, total ms/frame)."""
+    path, func_name, add_bodies = SCRIPTS[name]
+    with headless.installed() as screen:
+        ns = runpy.run_path(os.path.join(HERE, path), run_name="__benchmark__")
+        frame = ns[func_name]
+        env = frame.__globals__  # live module globals (run_path returns a copy)
+        add_bodies(env, np.random.default_rng(seed), bodies)
+        if renderer and "set_renderer" in env:  # projects.py only
+            env["set_renderer"](renderer)
+
+        clock = env["clock"]
+        fake_time = [0.0]
+
+        def fake_now():
+            fake_time[0] += clock.step  # exactly one physics step per frame
+            return fake_time[0]
+        clock.now = fake_now
+        clock.reset()
+        env["scheduler"].max_skip = 0  # always draw, even when slower than the target
+
+        canvases = {id(screen.cv): screen.cv}
+        cv = env.get("canvas")
+        if cv is not None:
+            canvases[id(cv)] = cv
+        frame()  # warm-up (first-frame allocations)
+        for c in canvases.values():
+            c.calls.clear()
+        timer = env["frame_timer"]
+        timer.reset()
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame()
+        total = (time.perf_counter() - start) * 1000.0 / frames
+        calls = sum(sum(c.calls.values()) for c in canvases.values()) / frames
+        return timer.average_ms(), calls, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-cost benchmark.")
+    parser.add_argument("--scripts", nargs="+", choices=sorted(SCRIPTS),
+                        default=["final", "projects", "mini"])
+    parser.add_argument("--bodies", nargs="+", type=int, default=[0, 100, 1000],
+                        help="extra bodies added on top of each scene")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--renderer", choices=["turtle", "canvas"],
+                        help="body renderer for projects.py (default: its own)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HERE)
+    results = []
+    for name in args.scripts:
+        for bodies in args.bodies:
+            phases, calls, total = run_script(name, bodies, args.frames,
+                                              renderer=args.renderer)
+            results.append({"script": name, "extra_bodies": bodies,
+                            "frames": args.frames, "ms_per_frame": total,
+                            "canvas_calls_per_frame": calls, "phases_ms": phases})
+            detail = "  ".join(f"{k}={v:.3f}" for k, v in phases.items())
+            print(f"{name:9s} +{bodies:<6d} {total:8.3f} ms/frame "
+                  f"{calls:9.0f} calls/frame  {detail}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
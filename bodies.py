@@ -0,0 +1,132 @@
+"""
+Body Store
+----------
+Struct-of-arrays storage for per-body data.
+
+A dict or object per body costs hundreds of bytes before it holds any
+data (plus kilobytes for its turtles), which rules out 100k bodies. A
+`BodyStore` keeps every field in one growable column instead:
+
+- numeric fields are NumPy arrays (8 bytes per body or less)
+- text fields are object arrays sharing the same string objects
+- display handles (turtles, labels, trails) are kept apart, in sparse
+  dicts, so only the bodies that are actually drawn pay for them
+
+`store.view(row)` (or iterating the store) gives a small `__slots__`
+object whose attributes read and write the columns, so per-body code
+still reads `p.name`, `p.diameter`, `p.turtle`. Classes that need
+methods can subclass `store.view_class` and add their own `__slots__`.
+
+    planets = BodyStore(handles=("turtle",), name=object, diameter=np.int64)
+    p = planets.add(name="Earth", diameter=12742)
+    planets["diameter"]          # the whole column, as a NumPy view
+"""
+import numpy as np
+
+
+class BodyView:
+    """One body of a store; attributes are generated per store."""
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __eq__(self, other):
+        return (isinstance(other, BodyView) and other.store is self.store
+                and other.row == self.row)
+
+    def __hash__(self):
+        return hash((id(self.store), self.row))
+
+    def __repr__(self):
+        return f"<body {self.row} of {len(self.store)}>"
+
+
+def _column_property(name, as_python):
+    def get(self):
+        value = self.store._data[name][self.row]
+        return value.item() if as_python else value
+
+    def set(self, value):
+        self.store._data[name][self.row] = value
+    return property(get, set)
+
+
+def _handle_property(name):
+    def get(self):
+        return self.store.handles[name].get(self.row)
+
+    def set(self, value):
+        self.store.handles[name][self.row] = value
+    return property(get, set)
+
+
+class BodyStore:
+    def __init__(self, handles=(), **columns):
+        """`columns` maps field name -> dtype; `handles` names display fields."""
+        self.count = 0
+        self._data = {name: np.empty(0, dtype=dtype) for name, dtype in columns.items()}
+        self.handles = {name: {} for name in handles}  # name -> {row: handle}
+        attrs = {"__slots__": ()}
+        for name, column in self._data.items():
+            attrs[name] = _column_property(name, column.dtype != object)
+        for name in handles:
+            attrs[name] = _handle_property(name)
+        self.view_class = type("Body", (BodyView,), attrs)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, name):
+        """Column `name` for all bodies (a view: writes go to the store)."""
+        return self._data[name][:self.count]
+
+    def __iter__(self):
+        return (self.view_class(self, row) for row in range(self.count))
+
+    def view(self, row):
+        return self.view_class(self, row)
+
+    def _reserve(self, n):
+        capacity = len(next(iter(self._data.values()))) if self._data else 0
+        if self.count + n <= capacity:
+            return
+        capacity = max(self.count + n, 2 * capacity, 16)
+        for name, column in self._data.items():
+            # text columns start as None, numeric ones as 0
+            grown = (np.empty if column.dtype == object else np.zeros)(capacity, column.dtype)
+            grown[:self.count] = column[:self.count]
+            self._data[name] = grown
+
+    def add(self, **values):
+        """Append one body (missing fields are 0, or None for text); return its view."""
+        unknown = set(values) - set(self._data) - set(self.handles)
+        if unknown:
+            raise TypeError(f"unknown body fields: {', '.join(sorted(unknown))}")
+        row = int(self.add_many(1, **{k: [v] for k, v in values.items()
+                                      if k in self._data})[0])
+        body = self.view(row)
+        for name in self.handles:
+            if name in values:
+                setattr(body, name, values[name])
+        return body
+
+    def add_many(self, n, **columns):
+        """Append n bodies from column arrays (or scalars); return their rows."""
+        self._reserve(n)
+        first = self.count
+        for name, values in columns.items():
+            self._data[name][first:first + n] = values
+        self.count += n
+        return np.arange(first, first + n)
+
+    def find(self, name, value):
+        """First body whose column `name` equals value, or None."""
+        rows = np.flatnonzero(self[name] == value)
+        return self.view(int(rows[0])) if len(rows) else None
+
+    @property
+    def nbytes(self):
+        """Bytes used by the columns (capacity included, handles excluded)."""
+        return sum(column.nbytes for column in self._data.values())
@@ -0,0 +1,169 @@
+"""
+Catalog
+-------
+Body catalogs on disk, shared by every script.
+
+- Small tables (the planets and moons of each scene) live in
+  data/planets.json as {"columns": [...], "rows": [[...], ...]}.
+  `load_table(name)` returns the rows as tuples in column order.
+- Large minor-body sets use a compact binary file: a short JSON header
+  followed by one fixed-width little-endian block per column. `Catalog`
+  only reads the header when opened; each column is memory-mapped on
+  first use, so touching the `a` column of a million asteroids reads
+  4 MB (float32) and never creates per-body Python objects. Rows are
+  sliced or selected from the mapped columns on demand.
+
+Layout of a binary catalog:
+
+    b"SSCAT\\x00\\x01\\x00"  magic + version
+    uint32               header length
+    header               JSON: count, meta, columns [[name, dtype, offset]]
+    column blocks        each aligned to 64 bytes
+
+Usage:
+    python catalog.py asteroids data/asteroids.cat --count 1000000
+"""
+import argparse
+import json
+import os
+import struct
+from functools import lru_cache
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PLANETS_JSON = os.path.join(HERE, "data", "planets.json")
+ASTEROIDS_CAT = os.path.join(HERE, "data", "asteroids.cat")
+
+MAGIC = b"SSCAT\x00\x01\x00"
+ALIGN = 64
+
+# Kepler elements, in the order KeplerOrbits.add_bodies() takes them
+ELEMENT_COLUMNS = ("a", "e", "i", "node", "peri", "M0")
+
+
+# ---------- JSON tables ----------
+@lru_cache(maxsize=None)
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_table(name, path=PLANETS_JSON):
+    """Rows of a JSON table as tuples (column order as in the file)."""
+    return [tuple(row) for row in _read_json(path)[name]["rows"]]
+
+
+# ---------- Binary catalogs ----------
+def _aligned(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def write_catalog(path, columns, meta=None):
+    """Write {name: 1-D array} (all the same length) as a binary catalog."""
+    arrays = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+    count = len(next(iter(arrays.values()))) if arrays else 0
+    if any(len(a) != count for a in arrays.values()):
+        raise ValueError("catalog columns must all have the same length")
+
+    def header(offsets):
+        layout = [[name, a.dtype.newbyteorder("<").str, off]
+                  for (name, a), off in zip(arrays.items(), offsets)]
+        return json.dumps({"count": count, "meta": meta or {},
+                           "columns": layout}).encode()
+
+    # offsets depend on the header length, which depends on the offsets:
+    # size the header with placeholder offsets of the final width
+    start = _aligned(len(MAGIC) + 4 + len(header([10 ** 15] * len(arrays))))
+    offsets, pos = [], start
+    for a in arrays.values():
+        offsets.append(pos)
+        pos = _aligned(pos + a.nbytes)
+    head = header(offsets)
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(head)) + head)
+        for a, off in zip(arrays.values(), offsets):
+            f.seek(off)
+            f.write(a.astype(a.dtype.newbyteorder("<"), copy=False).tobytes())
+        f.truncate(pos)
+
+
+class Catalog:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a body catalog")
+            (size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(size))
+        self.count = header["count"]
+        self.meta = header["meta"]
+        self._layout = {name: (np.dtype(dtype), offset)
+                        for name, dtype, offset in header["columns"]}
+        self._maps = {}  # column name -> memmap, opened on first use
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def columns(self):
+        return list(self._layout)
+
+    def column(self, name):
+        """Memory-mapped, read-only column (nothing is read until indexed)."""
+        if name not in self._maps:
+            dtype, offset = self._layout[name]
+            self._maps[name] = np.memmap(self.path, dtype=dtype, mode="r",
+                                         offset=offset, shape=(self.count,))
+        return self._maps[name]
+
+    def rows(self, start=0, stop=None, columns=None):
+        """{column: array} for rows [start, stop), copied out of the map."""
+        return {name: np.array(self.column(name)[start:stop])
+                for name in (columns or self.columns)}
+
+    def take(self, index, columns=None):
+        """{column: array} for the given row indices or boolean mask."""
+        return {name: self.column(name)[index] for name in (columns or self.columns)}
+
+    def where(self, name, lo, hi, chunk=1 << 20):
+        """Indices of rows with lo <= column < hi, reading one column in chunks."""
+        col = self.column(name)
+        found = [start + np.flatnonzero((col[start:start + chunk] >= lo)
+                                        & (col[start:start + chunk] < hi))
+                 for start in range(0, self.count, chunk)]
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.intp)
+
+
+def random_asteroids(count, seed=None, a_range=(2.1, 3.3)):
+    """Synthetic main-belt elements (same ranges as KeplerOrbits.add_random_asteroids)."""
+    rng = np.random.default_rng(seed)
+    return {
+        "a": rng.uniform(*a_range, count),
+        "e": rng.uniform(0.0, 0.25, count),
+        "i": rng.uniform(0.0, 20.0, count),
+        "node": rng.uniform(0, 360, count),
+        "peri": rng.uniform(0, 360, count),
+        "M0": rng.uniform(0, 360, count),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build binary body catalogs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    make = sub.add_parser("asteroids", help="synthetic main-belt asteroids")
+    make.add_argument("path", nargs="?", default=ASTEROIDS_CAT)
+    make.add_argument("--count", type=int, default=1_000_000)
+    make.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+    elements = random_asteroids(args.count, args.seed)
+    # float32 is plenty for scenery and halves the file (24 bytes per body)
+    write_catalog(args.path, {k: v.astype(np.float32) for k, v in elements.items()},
+                  meta={"kind": "asteroids", "units": "AU, degrees, J2000"})
+    print(f"Wrote {args.count} asteroids to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Clock
+-----
+Fixed-timestep simulation clock and a deadline-based frame scheduler.
+
+Physics always advances in steps of exactly `step` seconds, however fast
+or slow frames are rendered:
+
+- real elapsed time is collected in an accumulator
+- `advance()` says how many whole physics steps are due this frame
+- `alpha` is the leftover fraction of a step, used to interpolate the
+  rendered positions between the last two physics states
+- at most `max_steps` are run per frame; beyond that the backlog is
+  dropped so a slow machine renders fewer frames instead of spiralling
+
+`FrameScheduler` replaces "wait a fixed delay after each frame" (real
+period = delay + work, drifting under load) with absolute deadlines every
+1 / fps seconds: the delay shrinks by however long the frame took, a
+frame that is behind runs physics but skips drawing, and a large backlog
+is dropped instead of replayed in a burst.
+"""
+import time
+
+
+class FixedStepClock:
+    def __init__(self, step=1 / 60, max_steps=5, now=time.perf_counter):
+        self.step = step
+        self.max_steps = max_steps
+        self.now = now
+        self.accumulator = 0.0
+        self.last = now()
+        self.steps_taken = 0    # total physics steps (simulated time / step)
+        self.dropped_steps = 0  # steps skipped because of the catch-up cap
+
+    def reset(self):
+        """Forget elapsed time (e.g. while paused)."""
+        self.last = self.now()
+        self.accumulator = 0.0
+
+    def advance(self):
+        """Collect elapsed time; return the number of physics steps to run."""
+        t = self.now()
+        self.accumulator += t - self.last
+        self.last = t
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # drop the backlog, keep only the fraction of a step
+            self.dropped_steps += steps - self.max_steps
+            self.accumulator -= (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        self.accumulator -= steps * self.step
+        self.steps_taken += steps
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.step, 1.0)
+
+    @property
+    def sim_time(self):
+        return self.steps_taken * self.step
+
+
+class FrameScheduler:
+    def __init__(self, fps=60, max_skip=2, max_lag=3, now=time.perf_counter):
+        self.now = now
+        self.max_skip = max_skip  # consecutive frames that may skip drawing
+        self.max_lag = max_lag    # frames behind before the schedule resyncs
+        self.deadline = None
+        self.render = True        # draw this frame? (False while catching up)
+        self.skipped_renders = 0
+        self.missed_frames = 0    # deadlines given up on by a resync
+        self._skips = 0
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        self.fps = float(fps)
+        self.period = 1.0 / self.fps
+
+    def reset(self):
+        self.deadline = None
+        self.render = True
+        self._skips = 0
+
+    def frame_done(self):
+        """Call at the end of a frame; return the delay (ms) to the next one."""
+        t = self.now()
+        if self.deadline is None:
+            self.deadline = t
+        self.deadline += self.period
+        behind = t - self.deadline
+        if behind > self.max_lag * self.period:
+            # hopelessly late: start a fresh schedule from now
+            self.missed_frames += int(behind / self.period)
+            self.deadline = t
+            behind = 0.0
+        self.render = behind <= 0 or self._skips >= self.max_skip
+        if self.render:
+            self._skips = 0
+        else:
+            self._skips += 1
+            self.skipped_renders += 1
+        return max(int((self.deadline - t) * 1000.0), 0)
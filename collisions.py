@@ -0,0 +1,163 @@
+"""
+Collisions
+----------
+Close-approach and collision events between moving bodies.
+
+Testing every pair is O(N²) per frame. `SweepAndPrune` keeps the bodies
+sorted along x instead and only tests bodies whose x ranges overlap:
+
+- the order from the previous frame is re-sorted with a stable (Tim)sort,
+  which is close to linear when bodies only moved a little (frame-to-frame
+  coherence), so the sort is not redone from scratch
+- each watched body finds the bodies within reach along x with two binary
+  searches on the sorted array; only those candidates get the y and
+  distance tests, all in NumPy
+- `watch` limits the queries to the bodies of interest (planets, comets),
+  so thousands of asteroids are checked against them but not against each
+  other; bodies in the same `group` (a planet and its moons) are ignored
+
+Two bodies are in a close approach while their surfaces are within
+`approach` px of each other, and colliding while their discs overlap.
+Callbacks fire when a pair starts approaching (`on_approach`), starts
+colliding (`on_collision`) and moves apart again (`on_separate`), each
+as callback(i, j, distance) with i < j.
+
+`Highlights` draws a ring around every body that is in an encounter.
+"""
+import numpy as np
+
+
+def _member(keys, sorted_keys):
+    """keys found in the sorted array sorted_keys (binary search, no hashing)."""
+    k = np.searchsorted(sorted_keys, keys)
+    found = np.zeros(len(keys), dtype=bool)
+    inside = k < len(sorted_keys)
+    found[inside] = sorted_keys[k[inside]] == keys[inside]
+    return found
+
+
+class SweepAndPrune:
+    def __init__(self, approach=10.0, on_approach=None, on_collision=None,
+                 on_separate=None):
+        self.approach = float(approach)
+        self.on_approach = on_approach
+        self.on_collision = on_collision
+        self.on_separate = on_separate
+        self.reset()
+
+    def reset(self):
+        """Forget the sort order and the current encounters (no callbacks)."""
+        self._order = np.zeros(0, dtype=np.intp)
+        self._keys = np.zeros(0, dtype=np.int64)       # active pairs, i * n + j
+        self._hit_keys = np.zeros(0, dtype=np.int64)   # colliding pairs
+        self.pairs = np.zeros((0, 2), dtype=np.intp)
+        self.distance = np.zeros(0)
+        self.colliding = np.zeros(0, dtype=bool)
+
+    def _sort(self, xs):
+        if len(self._order) != len(xs):
+            self.reset()
+            self._order = np.argsort(xs, kind="stable")
+        else:
+            # nearly sorted already: timsort runs in about O(N)
+            self._order = self._order[np.argsort(xs[self._order], kind="stable")]
+        return self._order
+
+    def _candidates(self, xs, reach, watch):
+        """(i, j) index arrays of pairs whose x ranges overlap."""
+        order = self._sort(xs)
+        sx = xs[order]
+        queries = np.arange(len(xs)) if watch is None else np.flatnonzero(watch)
+        widest = reach.max() if len(reach) else 0.0
+        lo = np.searchsorted(sx, xs[queries] - reach[queries] - widest, side="left")
+        hi = np.searchsorted(sx, xs[queries] + reach[queries] + widest, side="right")
+        counts = hi - lo
+        i = np.repeat(queries, counts)
+        # position within each query's run of the sorted array
+        start = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        j = order[np.arange(counts.sum()) + start]
+        # each pair once: a watched j is kept only from its own query too
+        keep = (j > i) if watch is None else ((j > i) | ((j < i) & ~watch[j]))
+        return i[keep], j[keep]
+
+    def update(self, xs, ys, radii, watch=None, group=None):
+        """Find this frame's encounters and fire the callbacks; return the pairs."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        n = len(xs)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), xs.shape)
+        if watch is not None:
+            watch = np.asarray(watch, dtype=bool)
+        reach = radii + self.approach / 2
+
+        i, j = self._candidates(xs, reach, watch)
+        if group is not None:
+            group = np.asarray(group)
+            same = group[i] == group[j]
+            i, j = i[~same], j[~same]
+        limit = reach[i] + reach[j]
+        dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+        near = (np.abs(dx) <= limit) & (np.abs(dy) <= limit)
+        i, j, dx, dy, limit = i[near], j[near], dx[near], dy[near], limit[near]
+        dist = np.hypot(dx, dy)
+        near = dist <= limit
+        a, b, dist = np.minimum(i, j)[near], np.maximum(i, j)[near], dist[near]
+        keys = a.astype(np.int64) * n + b
+        order = np.argsort(keys)
+        keys, a, b, dist = keys[order], a[order], b[order], dist[order]
+        hits = dist <= radii[a] + radii[b]
+
+        if self.on_approach is not None:
+            for k in np.flatnonzero(~_member(keys, self._keys)).tolist():
+                self.on_approach(int(a[k]), int(b[k]), float(dist[k]))
+        if self.on_collision is not None:
+            for k in np.flatnonzero(hits & ~_member(keys, self._hit_keys)).tolist():
+                self.on_collision(int(a[k]), int(b[k]), float(dist[k]))
+        if self.on_separate is not None:
+            for key in self._keys[~_member(self._keys, keys)].tolist():
+                self.on_separate(key // n, key % n, float("nan"))
+
+        self._keys, self._hit_keys = keys, keys[hits]
+        self.pairs = np.column_stack([a, b])
+        self.distance = dist
+        self.colliding = hits
+        return self.pairs
+
+
+class Highlights:
+    """Rings around the bodies in an encounter (a reused pool of canvas ovals)."""
+
+    def __init__(self, screen, approach_color="#00E5FF", collision_color="#FF3030",
+                 pad=4, tag="highlights"):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.approach_color = approach_color
+        self.collision_color = collision_color
+        self.pad = pad
+        self.tag = tag
+        self.items = []
+        self.shown = 0
+
+    def draw(self, xs, ys, radii, sweep):
+        """Ring every body of `sweep.pairs`; colliding ones in the collision colour."""
+        rows = np.unique(sweep.pairs)
+        hit = np.isin(rows, sweep.pairs[sweep.colliding])
+        while len(self.items) < len(rows):
+            self.items.append(self.cv.create_oval(0, 0, 0, 0, width=2, state="hidden",
+                                                  tags=(self.tag,)))
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), np.shape(xs))
+        for item, k, h in zip(self.items, rows.tolist(), hit.tolist()):
+            cx = xs[k] * self.screen.xscale
+            cy = -ys[k] * self.screen.yscale
+            r = radii[k] + self.pad
+            self.cv.coords(item, cx - r, cy - r, cx + r, cy + r)
+            self.cv.itemconfigure(item, state="normal",
+                                  outline=self.collision_color if h else self.approach_color)
+        for item in self.items[len(rows):self.shown]:
+            self.cv.itemconfigure(item, state="hidden")
+        self.shown = len(rows)
+
+    def clear(self):
+        for item in self.items[:self.shown]:
+            self.cv.itemconfigure(item, state="hidden")
+        self.shown = 0
@@ -0,0 +1,101 @@
+"""
+Decorations
+-----------
+Ornaments that travel with a body: rings, glows and the like.
+
+Each decoration is built once as canvas items around the canvas origin,
+tagged with its body, and afterwards only translated: one `move` call per
+decorated body per frame (and none if the body did not move), instead of
+clearing and retracing turtle circles every frame.
+
+- "ring": an outline circle of `radius` px, `width` px thick
+- "glow": a soft halo from `radius - width` to `radius` px, fading out;
+  drawn as a paletted PNG with transparency that is built once per
+  (color, radius, width) and shared by every body using it
+
+Decorations are attached by configuration (see HELIX_DECORATIONS in
+scenes.py) rather than by checking body names in the frame loop.
+"""
+import base64
+import tkinter as tk
+
+import numpy as np
+
+from raster import parse_color, png_bytes
+
+
+def _glow_png(color, radius, width):
+    """Halo image: opaque at the inner edge, transparent at `radius`."""
+    size = 2 * radius + 1
+    yy, xx = np.mgrid[0:size, 0:size] - radius
+    r = np.hypot(xx, yy)
+    inner = max(radius - width, 0)
+    fade = np.clip((radius - r) / max(width, 1), 0.0, 1.0)
+    fade[r < inner] = 0.0  # the body itself stays uncovered
+    alpha = (160 * fade).astype(np.uint8)
+    palette = np.empty((256, 4), dtype=np.uint8)
+    palette[:, :3] = parse_color(color)
+    palette[:, 3] = np.arange(256)
+    return png_bytes(alpha, palette=palette)
+
+
+class Decorations:
+    def __init__(self, screen, tag="decor"):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.tag = tag
+        self.rows = []           # decorated engine body indices
+        self._x = np.zeros(0)    # canvas position the items are at now
+        self._y = np.zeros(0)
+        self._shown = np.zeros(0, dtype=bool)
+        self._images = {}        # (color, radius, width) -> PhotoImage
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _body_tag(self, index):
+        return f"{self.tag}{index}"
+
+    def add(self, index, kind, color, radius, width=1):
+        """Attach a decoration to engine body `index`."""
+        tags = (self.tag, self._body_tag(index))
+        if kind == "ring":
+            item = self.cv.create_oval(-radius, -radius, radius, radius,
+                                       outline=color, width=width, tags=tags)
+        elif kind == "glow":
+            key = (color, radius, width)
+            if key not in self._images:
+                data = base64.b64encode(_glow_png(color, radius, width))
+                self._images[key] = tk.PhotoImage(data=data, format="png")
+            item = self.cv.create_image(0, 0, image=self._images[key], tags=tags)
+        else:
+            raise ValueError(f"unknown decoration kind: {kind}")
+        if index in self.rows:
+            # new items start at the origin; bring them to the body's others
+            k = self.rows.index(index)
+            self.cv.move(item, self._x[k], self._y[k])
+            if not self._shown[k]:
+                self.cv.itemconfigure(item, state="hidden")
+            return
+        self.cv.itemconfigure(item, state="hidden")
+        self.rows.append(index)
+        self._x = np.append(self._x, 0.0)
+        self._y = np.append(self._y, 0.0)
+        self._shown = np.append(self._shown, False)
+
+    def draw(self, xs, ys, visible):
+        """Translate each decorated body's items to its position."""
+        if not self.rows:
+            return
+        rows = np.asarray(self.rows)
+        cx = np.asarray(xs, dtype=float)[rows] * self.screen.xscale
+        cy = -np.asarray(ys, dtype=float)[rows] * self.screen.yscale
+        visible = np.asarray(visible, dtype=bool)[rows]
+        moved = visible & ((cx != self._x) | (cy != self._y))
+        for k in np.flatnonzero(moved).tolist():
+            self.cv.move(self._body_tag(self.rows[k]), cx[k] - self._x[k], cy[k] - self._y[k])
+        self._x[moved], self._y[moved] = cx[moved], cy[moved]
+        for k in np.flatnonzero(visible != self._shown).tolist():
+            self.cv.itemconfigure(self._body_tag(self.rows[k]),
+                                  state="normal" if visible[k] else "hidden")
+        self._shown = visible
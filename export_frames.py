@@ -0,0 +1,161 @@
+"""
+Frame Export
+------------
+Headless rendering of the turtle scenes to numbered PNG/PPM images.
+
+The scenes from Final_project.py ("final") and solar_system_turtle.py
+("mini") are rebuilt from scenes.py without any window. The time range is
+split into chunks that a process pool renders in parallel; every worker
+rasterizes the static background (stars, orbits, Sun) once and then only
+stamps the moving bodies per frame. Planet positions come straight from
+the engine at time t, so chunks are independent of each other.
+
+Text labels are not rasterized (there is no font renderer in the
+standard library).
+
+Usage:
+    python export_frames.py final --seconds 600 --fps 30 --size 1920x1080 --out frames
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from orbit_engine import OrbitEngine
+from orbits import orbit_points
+from raster import draw_disc, draw_polyline, parse_color, write_image
+from scenes import FINAL_PLANETS, FINAL_SCENE, MINI_MOONS, MINI_PLANETS, MINI_SCENE
+from starfield import render_star_field
+
+
+class SceneRenderer:
+    def __init__(self, name, width, height):
+        self.width, self.height = width, height
+        self.engine = OrbitEngine()
+        self.colors, self.radii = [], []
+        self.satellites = []  # (body index, parent index) for moon guides
+        if name == "final":
+            self.scene = FINAL_SCENE
+            for name_, color, a, b, size, speed, *_ in FINAL_PLANETS:
+                self._add(self.engine.add_body(a, b, speed=speed), color, 10 * size)
+            guides = [(row[2], row[3], 0) for row in FINAL_PLANETS]
+        elif name == "mini":
+            self.scene = MINI_SCENE
+            index = {}
+            for name_, color, size_px, a, b, speed, tilt in MINI_PLANETS:
+                index[name_] = self.engine.add_body(a, b, speed=speed, tilt=tilt)
+                self._add(index[name_], color, max(size_px / 20.0, 0.2) * 10)
+            for name_, color, size_px, parent, r, speed in MINI_MOONS:
+                i = self.engine.add_body(r, speed=speed, parent=index[parent])
+                self._add(i, color, max(size_px / 20.0, 0.2) * 10)
+                self.satellites.append((i, index[parent]))
+            guides = [(row[3], row[4], row[6]) for row in MINI_PLANETS]
+        else:
+            raise ValueError(f"unknown scene {name!r} (use 'final' or 'mini')")
+
+        self.angle0 = self.engine.angle.copy()
+        self.scale = min(width / self.scene["width"], height / self.scene["height"])
+        self.orbit_rgb = parse_color(self.scene["orbit_color"])
+        self.background = self._render_background(guides)
+
+    def _add(self, index, color, radius):
+        assert index == len(self.colors)
+        self.colors.append(parse_color(color))
+        self.radii.append(radius)
+
+    def to_pixels(self, x, y):
+        return self.width / 2 + x * self.scale, self.height / 2 - y * self.scale
+
+    def _render_background(self, guides):
+        stars = self.scene["stars"]
+        sw = int(stars["width"] * self.scale)
+        sh = int(stars["height"] * self.scale)
+        field = render_star_field(sw, sh, stars["count"], stars["seed"], stars["sizes"])
+        img = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        # centre the star field, cropping if it is larger than the frame
+        x0, y0 = (self.width - sw) // 2, (self.height - sh) // 2
+        fx, fy = max(-x0, 0), max(-y0, 0)
+        x0, y0 = max(x0, 0), max(y0, 0)
+        w, h = min(sw - fx, self.width - x0), min(sh - fy, self.height - y0)
+        img[y0:y0 + h, x0:x0 + w] = field[fy:fy + h, fx:fx + w]
+
+        for a, b, tilt in guides:
+            self._draw_orbit(img, a, b, tilt, 0.0, 0.0, self.orbit_rgb)
+        for r, color, filled, pen in self.scene["sun"]:
+            if filled:
+                draw_disc(img, *self.to_pixels(0, 0), r * self.scale, parse_color(color))
+            else:
+                self._draw_orbit(img, r, r, 0, 0.0, 0.0, parse_color(color), pen)
+        return img
+
+    def _draw_orbit(self, img, a, b, tilt, cx, cy, color, width=1):
+        pts = np.asarray(orbit_points(float(a), float(b), float(tilt), 360))
+        px, py = self.to_pixels(cx + pts[0::2], cy - pts[1::2])
+        draw_polyline(img, px, py, color, max(int(round(width * self.scale)), 1))
+
+    def render(self, t):
+        """RGB frame for simulated time t (seconds)."""
+        steps = t / self.scene["step"]
+        self.engine.angle = (self.angle0 + self.engine.speed * steps) % 360.0
+        xs, ys = self.engine.evaluate()
+        img = self.background.copy()
+        for i, parent in self.satellites:
+            self._draw_orbit(img, self.engine.a[i], self.engine.a[i], 0,
+                             xs[parent], ys[parent], self.orbit_rgb)
+        px, py = self.to_pixels(xs, ys)
+        for i, color in enumerate(self.colors):
+            draw_disc(img, px[i], py[i], self.radii[i] * self.scale, color)
+        return img
+
+
+# ---------- Process pool ----------
+_renderer = None
+
+
+def _init_worker(name, width, height):
+    global _renderer
+    _renderer = SceneRenderer(name, width, height)
+
+
+def _render_chunk(first, last, fps, start, out_dir, ext):
+    for frame in range(first, last):
+        img = _renderer.render(start + frame / fps)
+        write_image(os.path.join(out_dir, f"frame_{frame:06d}.{ext}"), img)
+    return last - first
+
+
+def export(name, seconds, fps=30, size=(1920, 1080), out_dir="frames",
+           ext="png", start=0.0, workers=None):
+    """Render frames for [start, start + seconds) into out_dir; return the count."""
+    os.makedirs(out_dir, exist_ok=True)
+    total = int(round(seconds * fps))
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, -(-total // (workers * 4)))  # a few chunks per worker
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(name, *size)) as pool:
+        jobs = [pool.submit(_render_chunk, first, min(first + chunk, total),
+                            fps, start, out_dir, ext)
+                for first in range(0, total, chunk)]
+        return sum(job.result() for job in jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export scene frames as images.")
+    parser.add_argument("scene", choices=["final", "mini"])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--start", type=float, default=0.0, help="start time (s)")
+    parser.add_argument("--size", default="1920x1080", help="WIDTHxHEIGHT")
+    parser.add_argument("--out", default="frames")
+    parser.add_argument("--format", choices=["png", "ppm"], default="png")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    count = export(args.scene, args.seconds, args.fps, (width, height), args.out,
+                   args.format, args.start, args.workers)
+    print(f"Wrote {count} frames to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
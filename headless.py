@@ -0,0 +1,219 @@
+"""
+Headless Tk
+-----------
+A display-free stand-in for the Tk canvas, widgets and turtle screens,
+used by benchmark.py to run the unmodified scripts without a window.
+
+- `StubCanvas` keeps canvas items in a dict and counts every call, so
+  benchmarks can report canvas work per frame
+- `installed()` patches tkinter/ttk/turtle while a script is executed;
+  timers and `mainloop()` are recorded but never run
+"""
+import itertools
+import tkinter as tk
+import turtle
+from collections import Counter
+from contextlib import contextmanager
+from tkinter import ttk
+
+
+class StubCanvas:
+    def __init__(self, master=None, width=1000, height=700, **options):
+        self.options = {"width": width, "height": height, **options}
+        self.items = {}
+        self.tags = {}  # tag -> item ids, like Tk's own tag lookup
+        self.calls = Counter()
+        self.timers = 0
+        self._ids = itertools.count(1)
+
+    def _create(self, kind, args, options):
+        self.calls["create_" + kind] += 1
+        item = next(self._ids)
+        tags = options.get("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        self.items[item] = {"type": kind, "coords": _flatten(args),
+                            "options": options, "tags": set(tags)}
+        for tag in tags:
+            self.tags.setdefault(tag, {})[item] = None
+        return item
+
+    def create_line(self, *args, **kw): return self._create("line", args, kw)
+    def create_polygon(self, *args, **kw): return self._create("polygon", args, kw)
+    def create_oval(self, *args, **kw): return self._create("oval", args, kw)
+    def create_rectangle(self, *args, **kw): return self._create("rectangle", args, kw)
+    def create_text(self, *args, **kw): return self._create("text", args, kw)
+    def create_image(self, *args, **kw): return self._create("image", args, kw)
+
+    def find_withtag(self, tag):
+        if tag == "all":
+            return tuple(self.items)
+        if isinstance(tag, int) or (isinstance(tag, str) and tag.isdigit()):
+            return (int(tag),) if int(tag) in self.items else ()
+        return tuple(self.tags.get(tag, ()))
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def coords(self, item, *args):
+        self.calls["coords"] += 1
+        ids = self.find_withtag(item)
+        if args:
+            for i in ids:
+                self.items[i]["coords"] = _flatten(args)
+            return None
+        return list(self.items[ids[0]]["coords"]) if ids else []
+
+    def move(self, item, dx, dy):
+        self.calls["move"] += 1
+        for i in self.find_withtag(item):
+            c = self.items[i]["coords"]
+            self.items[i]["coords"] = [v + (dx if k % 2 == 0 else dy)
+                                       for k, v in enumerate(c)]
+
+    def itemconfigure(self, item, **options):
+        self.calls["itemconfigure"] += 1
+        for i in self.find_withtag(item):
+            self.items[i]["options"].update(options)
+    itemconfig = itemconfigure
+
+    def addtag_withtag(self, newtag, tag):
+        for i in self.find_withtag(tag):
+            self.items[i]["tags"].add(newtag)
+            self.tags.setdefault(newtag, {})[i] = None
+
+    def itemcget(self, item, option):
+        ids = self.find_withtag(item)
+        return self.items[ids[0]]["options"].get(option, "") if ids else ""
+
+    def delete(self, *items):
+        self.calls["delete"] += 1
+        for item in items:
+            for i in self.find_withtag(item):
+                for tag in self.items.pop(i)["tags"]:
+                    self.tags[tag].pop(i, None)
+
+    def type(self, item):
+        ids = self.find_withtag(item)
+        return self.items[ids[0]]["type"] if ids else None
+
+    def bbox(self, item):
+        c = self.items.get(item, {"coords": [0, 0]})["coords"] or [0, 0]
+        xs, ys = c[0::2], c[1::2]
+        return int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1
+
+    def cget(self, option):
+        return self.options.get(option, "")
+
+    def config(self, **options):
+        self.options.update(options)
+    configure = config
+
+    def after(self, ms, func=None, *args):
+        self.timers += 1  # recorded, never fired: the caller drives frames
+        return "after#%d" % self.timers
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, ident):
+        pass
+
+    def winfo_rgb(self, color):
+        return (0, 0, 0)
+
+    def winfo_width(self): return int(self.options["width"])
+    def winfo_height(self): return int(self.options["height"])
+    def winfo_toplevel(self): return self
+    def canvasx(self, x): return x
+    def canvasy(self, y): return y
+
+    def _noop(self, *args, **kw):
+        return None
+    tag_lower = tag_raise = tag_bind = tag_unbind = bind = unbind = _noop
+    pack = grid = focus_force = focus_set = update = update_idletasks = _noop
+
+
+def _flatten(args):
+    flat = []
+    for a in args:
+        if isinstance(a, (list, tuple)):
+            flat.extend(_flatten(a))
+        else:
+            flat.append(float(a))
+    return flat
+
+
+class StubImage:
+    def __init__(self, *args, **options):
+        self.options = options
+
+    def blank(self): pass
+    def configure(self, **options): self.options.update(options)
+    def width(self): return int(self.options.get("width", 1))
+    def height(self): return int(self.options.get("height", 1))
+
+
+class HeadlessScreen(turtle.TurtleScreen):
+    def title(self, text): pass
+    def setup(self, width=None, height=None, startx=None, starty=None): pass
+    def bye(self): pass
+    def mainloop(self): pass
+    exitonclick = done = mainloop
+
+    def ontimer(self, fun, t=0):
+        self.cv.after(t, fun)
+
+
+class StubWidget:
+    def __init__(self, master=None, **options):
+        self.options = options
+
+    def config(self, **options):
+        self.options.update(options)
+    configure = config
+
+    def cget(self, option):
+        return self.options.get(option, "")
+
+    def _noop(self, *args, **kw):
+        return None
+    pack = grid = place = bind = title = geometry = mainloop = destroy = _noop
+    after = after_idle = after_cancel = protocol = _noop
+
+
+class StubVar:
+    def __init__(self, master=None, value=None, name=None):
+        self.value = value
+
+    def get(self): return self.value
+    def set(self, value): self.value = value
+    def trace_add(self, mode, callback): pass
+
+
+@contextmanager
+def installed(width=1000, height=700):
+    """Patch tkinter/turtle so the scripts build on stub canvases."""
+    screen_canvas = StubCanvas(width=width, height=height)
+    saved = {}
+
+    def patch(module, name, value):
+        saved[(module, name)] = getattr(module, name)
+        setattr(module, name, value)
+
+    patch(tk, "PhotoImage", StubImage)
+    for name in ("Tk", "Toplevel", "Frame", "Label", "Button", "Checkbutton", "Scale"):
+        patch(tk, name, StubWidget)
+    for name in ("Frame", "Label", "Button", "Checkbutton", "Radiobutton", "Scale"):
+        patch(ttk, name, StubWidget)
+    for name in ("DoubleVar", "BooleanVar", "IntVar", "StringVar"):
+        patch(tk, name, StubVar)
+    patch(tk, "Canvas", StubCanvas)
+    screen = HeadlessScreen(screen_canvas)
+    patch(turtle, "Screen", lambda: screen)
+    patch(turtle.Turtle, "_screen", screen)
+    try:
+        yield screen
+    finally:
+        for (module, name), value in saved.items():
+            setattr(module, name, value)
@@ -0,0 +1,138 @@
+"""
+Kepler Orbits
+-------------
+Bodies described by real orbital elements, positioned for any date.
+
+Each body has (a, e, i, Ω, ω, M0) at an epoch. `KeplerOrbits.positions(t)`
+solves Kepler's equation M = E - e·sin(E) for every body at once with a
+vectorized Newton–Raphson iteration, so jumping to any time costs the
+same as the next frame and thousands of minor bodies stay cheap.
+
+- distances in AU, angles in degrees, time in days since J2000
+- heliocentric, ecliptic coordinates; the planets' masses are ignored
+"""
+import numpy as np
+
+from catalog import ELEMENT_COLUMNS, random_asteroids
+
+DAYS_PER_YEAR = 365.25
+
+# J2000 elements (JPL approximate planetary positions):
+# name, a [AU], e, i, Ω (long. of node), ϖ (long. of perihelion), L (mean long.)
+PLANET_ELEMENTS = [
+    ("Mercury", 0.38709927, 0.20563593, 7.00497902, 48.33076593, 77.45779628, 252.25032350),
+    ("Venus",   0.72333566, 0.00677672, 3.39467605, 76.67984255, 131.60246718, 181.97909950),
+    ("Earth",   1.00000261, 0.01671123, -0.00001531, 0.0, 102.93768193, 100.46457166),
+    ("Mars",    1.52371034, 0.09339410, 1.84969142, 49.55953891, -23.94362959, -4.55343205),
+    ("Jupiter", 5.20288700, 0.04838624, 1.30439695, 100.47390909, 14.72847983, 34.39644051),
+    ("Saturn",  9.53667594, 0.05386179, 2.48599187, 113.66242448, 92.59887831, 49.95424423),
+    ("Uranus", 19.18916464, 0.04725744, 0.77263783, 74.01692503, 170.95427630, 313.23810451),
+    ("Neptune", 30.06992276, 0.00859048, 1.77004347, 131.78422574, 44.96476227, -55.12002969),
+]
+
+
+def solve_kepler(M, e, tol=1e-12, max_iter=30):
+    """Eccentric anomaly E (radians) for mean anomaly M (radians), batched."""
+    M = np.remainder(M, 2 * np.pi)
+    E = np.where(e < 0.8, M, np.pi)  # standard starting guess
+    for _ in range(max_iter):
+        f = E - e * np.sin(E) - M
+        dE = f / (1 - e * np.cos(E))
+        E = E - dE
+        if np.all(np.abs(dE) < tol):
+            break
+    return E
+
+
+class KeplerOrbits:
+    def __init__(self):
+        self.names = []
+        self.a = np.zeros(0)
+        self.e = np.zeros(0)
+        self.i = np.zeros(0)
+        self.node = np.zeros(0)    # Ω
+        self.peri = np.zeros(0)    # ω (argument of perihelion)
+        self.M0 = np.zeros(0)      # mean anomaly at epoch
+        self.epoch = 0.0           # days since J2000
+
+    def __len__(self):
+        return len(self.a)
+
+    def add_bodies(self, names, a, e, i, node, peri, M0):
+        """Append bodies from element arrays; return their indices."""
+        first = len(self)
+        self.names.extend(names)
+        self.a = np.concatenate([self.a, np.asarray(a, dtype=float)])
+        self.e = np.concatenate([self.e, np.asarray(e, dtype=float)])
+        self.i = np.concatenate([self.i, np.asarray(i, dtype=float)])
+        self.node = np.concatenate([self.node, np.asarray(node, dtype=float)])
+        self.peri = np.concatenate([self.peri, np.asarray(peri, dtype=float)])
+        self.M0 = np.concatenate([self.M0, np.asarray(M0, dtype=float)])
+        return np.arange(first, len(self))
+
+    @classmethod
+    def planets(cls):
+        orbits = cls()
+        names, a, e, i, node, varpi, L = zip(*PLANET_ELEMENTS)
+        varpi, node, L = np.array(varpi), np.array(node), np.array(L)
+        orbits.add_bodies(names, a, e, i, node, varpi - node, L - varpi)
+        return orbits
+
+    def add_random_asteroids(self, n, rng=None, a_range=(2.1, 3.3)):
+        """Synthetic main-belt asteroids (for load testing and scenery)."""
+        elements = random_asteroids(n, rng, a_range)
+        return self.add_bodies([""] * n, *(elements[c] for c in ELEMENT_COLUMNS))
+
+    def add_catalog(self, catalog, start=0, stop=None):
+        """Append rows [start, stop) of a binary Catalog (see catalog.py)."""
+        elements = catalog.rows(start, stop, ELEMENT_COLUMNS)
+        n = len(elements["a"])
+        return self.add_bodies([""] * n, *(elements[c] for c in ELEMENT_COLUMNS))
+
+    @property
+    def mean_motion(self):
+        """Degrees per day (Kepler's third law, a in AU)."""
+        return 360.0 / (DAYS_PER_YEAR * self.a ** 1.5)
+
+    def positions(self, t):
+        """Heliocentric ecliptic x, y, z (AU) of every body at day t."""
+        M = np.radians(self.M0 + self.mean_motion * (t - self.epoch))
+        E = solve_kepler(M, self.e)
+        # position in the orbital plane (x towards perihelion)
+        xp = self.a * (np.cos(E) - self.e)
+        yp = self.a * np.sqrt(1 - self.e ** 2) * np.sin(E)
+
+        w, O, inc = np.radians(self.peri), np.radians(self.node), np.radians(self.i)
+        cw, sw, cO, sO, ci, si = np.cos(w), np.sin(w), np.cos(O), np.sin(O), np.cos(inc), np.sin(inc)
+        x = (cw*cO - sw*sO*ci) * xp + (-sw*cO - cw*sO*ci) * yp
+        y = (cw*sO + sw*cO*ci) * xp + (-sw*sO + cw*cO*ci) * yp
+        z = (sw*si) * xp + (cw*si) * yp
+        return x, y, z
+
+
+class KeplerMotion:
+    """A KeplerOrbits set advanced in time steps (step(dt) / pos), e.g. for worker.py."""
+
+    def __init__(self, orbits, day=0.0, days_per_second=1.0):
+        self.orbits = orbits
+        self.day = day
+        self.days_per_second = days_per_second
+        self.step(0.0)
+
+    def step(self, dt):
+        """Advance dt seconds; pos becomes the (n, 2) ecliptic x, y in AU."""
+        self.day += dt * self.days_per_second
+        x, y, _ = self.orbits.positions(self.day)
+        self.pos = np.column_stack([x, y])
+
+
+def compress_radius(x, y, scale=66.0, power=0.53):
+    """Map AU to pixels with r_px = scale * r^power, keeping the direction.
+
+    The defaults put Mercury near 40 px and Neptune near 400 px, the
+    same range as the pixel orbits in projects.py.
+    """
+    r = np.hypot(x, y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k = np.where(r > 0, scale * r ** power / r, 0.0)
+    return x * k, y * k
@@ -0,0 +1,55 @@
+"""
+Labels
+------
+Change-driven text labels for turtle screens.
+
+A turtle `write()` creates a brand new canvas text item (plus a bbox
+query) every time, so the scripts used to clear and re-write every label
+on every frame. A `Label` instead owns ONE canvas text item:
+
+- moving the label only updates the item's coordinates
+- the text is re-rendered only when the values it shows change
+- formatted strings are cached, keyed on (template, values)
+"""
+from functools import lru_cache
+
+# turtle.write() alignment -> Tk text anchor
+ANCHORS = {"left": "sw", "center": "s", "right": "se"}
+
+
+@lru_cache(maxsize=4096)
+def format_text(template, values):
+    return template.format(*values)
+
+
+class Label:
+    def __init__(self, screen, template="{}", align="left",
+                 font=("Arial", 8, "normal"), color="white"):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.template = template
+        self._values = None
+        self._xy = None
+        self.visible = True
+        self.item = self.cv.create_text(0, 0, text="", anchor=ANCHORS[align],
+                                        fill=color, font=font)
+
+    def place(self, x, y, *values):
+        """Show the label at turtle coordinates (x, y) with the given values."""
+        if values != self._values:
+            self._values = values
+            self.cv.itemconfigure(self.item,
+                                  text=format_text(self.template, values))
+        # same canvas position turtle.write() would use
+        xy = (x * self.screen.xscale - 1, -y * self.screen.yscale)
+        if xy != self._xy:
+            self._xy = xy
+            self.cv.coords(self.item, *xy)
+        if not self.visible:
+            self.show(True)
+
+    def show(self, visible):
+        if visible != self.visible:
+            self.visible = visible
+            self.cv.itemconfigure(self.item,
+                                  state="normal" if visible else "hidden")
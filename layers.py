@@ -0,0 +1,89 @@
+"""
+Layers
+------
+Split a canvas scene into named layers with dirty flags.
+
+- A static layer has a `build()` that creates its canvas items once
+  (returning their ids); the items are tagged with the layer, so showing
+  or hiding the whole layer is a single `itemconfigure` on the tag and
+  nothing is ever redrawn.
+- A dynamic layer has a `draw()` that is only called by `compose()` when
+  the layer was marked dirty (and is visible), so frames where nothing
+  changed do not touch it.
+
+Z-order: layers added with `above=False` sit below everything else on
+the canvas (in the order they were added), `above=True` layers on top of
+everything. Items that belong to no layer (turtles, labels) stay in
+between. The stack is only re-ordered when a layer has just been built.
+"""
+
+
+class Layer:
+    def __init__(self, cv, name, build=None, draw=None, above=False, visible=True):
+        self.cv = cv
+        self.name = name
+        self.tag = f"layer:{name}"
+        self.build = build
+        self.draw = draw
+        self.above = above
+        self.visible = visible
+        self.built = build is None
+        self.dirty = draw is not None
+
+    def adopt(self, *items):
+        """Add existing canvas items to this layer."""
+        for item in items:
+            self.cv.addtag_withtag(self.tag, item)
+        if not self.visible:
+            self.cv.itemconfigure(self.tag, state="hidden")
+
+    def show(self, visible):
+        if visible == self.visible:
+            return
+        self.visible = visible
+        self.cv.itemconfigure(self.tag, state="normal" if visible else "hidden")
+        if visible and self.draw is not None:
+            self.dirty = True  # changes while hidden were not drawn
+
+    def toggle(self):
+        self.show(not self.visible)
+
+    def mark_dirty(self):
+        self.dirty = True
+
+
+class LayerStack:
+    def __init__(self, screen):
+        self.cv = screen.getcanvas()
+        self.layers = {}  # name -> Layer, in the order added
+
+    def __getitem__(self, name):
+        return self.layers[name]
+
+    def add(self, name, build=None, draw=None, above=False, visible=True):
+        layer = Layer(self.cv, name, build, draw, above, visible)
+        self.layers[name] = layer
+        return layer
+
+    def compose(self):
+        """Build new static layers, then redraw only the dirty dynamic ones."""
+        restack = False
+        for layer in self.layers.values():
+            if not layer.built:
+                layer.adopt(*(layer.build() or ()))
+                layer.built = True
+                restack = True
+            if layer.dirty and layer.visible:
+                layer.draw()
+                layer.dirty = False
+        if restack:
+            self._restack()
+
+    def _restack(self):
+        layers = list(self.layers.values())
+        for layer in reversed(layers):
+            if not layer.above:
+                self.cv.tag_lower(layer.tag)   # first added ends up lowest
+        for layer in layers:
+            if layer.above:
+                self.cv.tag_raise(layer.tag)   # last added ends up on top
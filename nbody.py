@@ -0,0 +1,177 @@
+"""
+N-Body Gravity
+--------------
+Optional mutual gravity for the Sun, planets and large asteroid belts.
+
+Forces use a Barnes–Hut quadtree: a cell far enough away (cell size /
+distance < theta) acts as one point mass at its centre of mass (bodies
+sharing a leaf are summed directly), so the cost grows like N log N
+instead of N². The tree is stored as one dense grid per depth and walked
+level by level for all particles at once, so every step is a handful of
+NumPy passes rather than a Python recursion.
+
+- theta = 0 gives exact direct summation, larger is faster and rougher
+- bodies with mass 0 are test particles: they feel gravity but add none
+- integration is kick-drift-kick leapfrog, stable for long runs
+"""
+import numpy as np
+
+G = 1.0
+
+
+class QuadTree:
+    """Barnes–Hut quadtree over 2-D points, one mass/COM grid per level."""
+
+    def __init__(self, pos, mass, depth=None):
+        n = len(pos)
+        if depth is None:
+            # about one body per leaf, capped to keep the grids small
+            depth = int(np.clip(np.ceil(np.log(max(n, 1)) / np.log(4)), 1, 9))
+        self.depth = depth
+        lo, hi = pos.min(axis=0), pos.max(axis=0)
+        self.size = max(float((hi - lo).max()), 1e-9) * (1 + 1e-9)
+        self.origin = (lo + hi) / 2 - self.size / 2
+
+        cells = 1 << depth
+        leaf = np.floor((pos - self.origin) / self.size * cells).astype(int)
+        self.leaf = np.clip(leaf, 0, cells - 1)  # (ix, iy) of each body's leaf
+
+        self.mass, self.com = [], []
+        for level in range(depth + 1):
+            shift = depth - level
+            key = self.key(level, self.leaf[:, 0] >> shift, self.leaf[:, 1] >> shift)
+            m = np.bincount(key, weights=mass, minlength=4 ** level)
+            mx = np.bincount(key, weights=mass * pos[:, 0], minlength=4 ** level)
+            my = np.bincount(key, weights=mass * pos[:, 1], minlength=4 ** level)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                com = np.stack([mx / m, my / m], axis=1)
+            self.mass.append(m)
+            self.com.append(com)
+
+        # bodies sorted by leaf, for direct summation inside the leaves
+        leaf_key = self.key(depth, self.leaf[:, 0], self.leaf[:, 1])
+        self.order = np.argsort(leaf_key, kind="stable")
+        self.leaf_count = np.bincount(leaf_key, minlength=4 ** depth)
+        self.leaf_start = np.cumsum(self.leaf_count) - self.leaf_count
+
+    @staticmethod
+    def key(level, ix, iy):
+        return (ix << level) + iy
+
+    def own_key(self, level, bodies):
+        shift = self.depth - level
+        return self.key(level, self.leaf[bodies, 0] >> shift, self.leaf[bodies, 1] >> shift)
+
+
+def barnes_hut_accel(pos, mass, theta=0.5, softening=1.0, chunk=4096):
+    """Gravitational acceleration on every body (N x 2 array)."""
+    pos = np.asarray(pos, dtype=float)
+    mass = np.asarray(mass, dtype=float)
+    n = len(pos)
+    acc = np.zeros((n, 2))
+    if n == 0 or not mass.any():
+        return acc
+    tree = QuadTree(pos, mass)
+    eps2 = softening * softening
+    for start in range(0, n, chunk):  # bounded memory for the pair lists
+        bodies = np.arange(start, min(start + chunk, n))
+        _walk(tree, pos, mass, bodies, theta, eps2, acc)
+    return acc * G
+
+
+def _walk(tree, pos, mass, bodies, theta, eps2, acc):
+    # (body, cell) pairs still to be resolved, starting at the root
+    p = bodies
+    c = np.zeros(len(bodies), dtype=int)
+    for level in range(tree.depth + 1):
+        m = tree.mass[level][c]
+        keep = m > 0
+        p, c, m = p[keep], c[keep], m[keep]
+        if not len(p):
+            return
+        com = tree.com[level][c]
+        inside = tree.own_key(level, p) == c
+
+        if level == tree.depth:
+            # leaf: sum the bodies inside directly (skipping the body itself)
+            count = tree.leaf_count[c]
+            first = np.repeat(tree.leaf_start[c] - np.cumsum(count) + count, count)
+            q = tree.order[first + np.arange(count.sum())]
+            p = np.repeat(p, count)
+            other = q != p
+            _add_pull(acc, pos, p[other], pos[q[other]], mass[q[other]], eps2)
+            return
+
+        d = com - pos[p]
+        cell = tree.size / (1 << level)
+        accept = ~inside & (cell * cell < theta * theta * (d * d).sum(axis=1))
+        if accept.any():
+            _add_pull(acc, pos, p[accept], com[accept], m[accept], eps2)
+
+        # open the remaining cells: each pair becomes four child pairs
+        p, c = p[~accept], c[~accept]
+        cx, cy = c >> level, c & ((1 << level) - 1)
+        p = np.repeat(p, 4)
+        cx = (np.repeat(cx, 4) << 1) + np.tile([0, 0, 1, 1], len(c))
+        cy = (np.repeat(cy, 4) << 1) + np.tile([0, 1, 0, 1], len(c))
+        c = tree.key(level + 1, cx, cy)
+
+
+def _add_pull(acc, pos, bodies, where, m, eps2):
+    """Add the pull of point masses m at `where` on each of `bodies`."""
+    d = where - pos[bodies]
+    r2 = (d * d).sum(axis=1) + eps2
+    f = m / (r2 * np.sqrt(r2))
+    acc[:, 0] += np.bincount(bodies, weights=f * d[:, 0], minlength=len(acc))
+    acc[:, 1] += np.bincount(bodies, weights=f * d[:, 1], minlength=len(acc))
+
+
+class NBodySystem:
+    def __init__(self, theta=0.5, softening=1.0):
+        self.theta = theta
+        self.softening = softening
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.mass = np.zeros(0)
+        self._acc = None
+
+    def __len__(self):
+        return len(self.mass)
+
+    def add_bodies(self, pos, vel, mass):
+        """Append bodies; return their indices."""
+        first = len(self)
+        self.pos = np.concatenate([self.pos, np.reshape(pos, (-1, 2))])
+        self.vel = np.concatenate([self.vel, np.reshape(vel, (-1, 2))])
+        self.mass = np.concatenate([self.mass, np.broadcast_to(
+            np.asarray(mass, dtype=float), (len(self.pos) - first,))])
+        self._acc = None
+        return np.arange(first, len(self))
+
+    def add_orbiting(self, central, radius, angle_deg, mass):
+        """Add bodies on circular orbits around body `central`."""
+        radius = np.atleast_1d(np.asarray(radius, dtype=float))
+        th = np.radians(np.broadcast_to(angle_deg, radius.shape))
+        unit = np.stack([np.cos(th), np.sin(th)], axis=1)
+        speed = np.sqrt(G * self.mass[central] / radius)
+        pos = self.pos[central] + unit * radius[:, None]
+        vel = self.vel[central] + np.stack([-unit[:, 1], unit[:, 0]], axis=1) * speed[:, None]
+        return self.add_bodies(pos, vel, mass)
+
+    def set_state(self, pos, vel):
+        """Replace positions and velocities (e.g. taken back from a worker)."""
+        self.pos = np.array(pos, dtype=float)
+        self.vel = np.array(vel, dtype=float)
+        self._acc = None
+
+    def accelerations(self):
+        return barnes_hut_accel(self.pos, self.mass, self.theta, self.softening)
+
+    def step(self, dt):
+        """One kick-drift-kick leapfrog step."""
+        if self._acc is None:
+            self._acc = self.accelerations()
+        self.vel += 0.5 * dt * self._acc
+        self.pos += dt * self.vel
+        self._acc = self.accelerations()
+        self.vel += 0.5 * dt * self._acc
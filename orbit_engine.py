@@ -0,0 +1,122 @@
+"""
+Orbit Engine
+------------
+Display-independent orbital state for every body in a scene.
+
+All bodies live in NumPy arrays (angle, speed, semi-axes, tilt, parent),
+so one call to `step()` advances the whole system and one call to
+`evaluate()` produces the x/y position arrays the turtle scripts draw from.
+
+- Angles and tilts are in degrees, speeds in degrees per step
+- A body may orbit another body (moons): give it a `parent` index
+- Thousands of bodies (asteroids, moons) cost one batched NumPy pass
+"""
+import numpy as np
+
+
+class OrbitEngine:
+    def __init__(self):
+        self.angle = np.zeros(0)               # current angle (degrees)
+        self.prev_angle = np.zeros(0)          # angle before the last step
+        self.speed = np.zeros(0)               # degrees per step
+        self.a = np.zeros(0)                   # semi-major axis (px)
+        self.b = np.zeros(0)                   # semi-minor axis (px)
+        self.tilt = np.zeros(0)                # orbit rotation (degrees)
+        self.parent = np.zeros(0, dtype=int)   # -1 = orbits the origin
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self._levels = None  # parent/child evaluation order, built lazily
+
+    def __len__(self):
+        return len(self.angle)
+
+    # ---------- Building ----------
+    def add_body(self, a, b=None, speed=1.0, tilt=0.0, angle=0.0, parent=-1):
+        """Add one body and return its index."""
+        if b is None:
+            b = a
+        return int(self.add_bodies([a], [b], [speed], [tilt], [angle], [parent])[0])
+
+    def add_bodies(self, a, b, speed, tilt=0.0, angle=0.0, parent=-1):
+        """Add many bodies at once (e.g. an asteroid belt); return their indices."""
+        a = np.atleast_1d(np.asarray(a, dtype=float))
+        n = len(a)
+        first = len(self)
+
+        def column(values, dtype=float):
+            return np.broadcast_to(np.asarray(values, dtype=dtype), (n,))
+
+        self.a = np.concatenate([self.a, a])
+        self.b = np.concatenate([self.b, column(b)])
+        self.speed = np.concatenate([self.speed, column(speed)])
+        self.tilt = np.concatenate([self.tilt, column(tilt)])
+        self.angle = np.concatenate([self.angle, column(angle) % 360.0])
+        self.prev_angle = np.concatenate([self.prev_angle, self.angle[first:]])
+        self.parent = np.concatenate([self.parent, column(parent, int)])
+        self.x = np.concatenate([self.x, np.zeros(n)])
+        self.y = np.concatenate([self.y, np.zeros(n)])
+        self._levels = None
+        return np.arange(first, first + n)
+
+    def _evaluation_levels(self):
+        """Group body indices so every parent is placed before its children."""
+        if self._levels is None:
+            depth = np.zeros(len(self), dtype=int)
+            node = self.parent.copy()
+            while (node >= 0).any():
+                has_parent = node >= 0
+                depth[has_parent] += 1
+                node[has_parent] = self.parent[node[has_parent]]
+            self._levels = [np.flatnonzero(depth == d)
+                            for d in range(1, depth.max(initial=0) + 1)]
+        return self._levels
+
+    # ---------- Simulation ----------
+    def step(self, scale=1.0):
+        """Advance every body by speed * scale degrees."""
+        self.prev_angle = self.angle
+        self.angle = (self.angle + self.speed * scale) % 360.0
+
+    def interpolated_angle(self, alpha):
+        """Angles between the last two steps (alpha 0 = previous, 1 = current)."""
+        if alpha >= 1.0:
+            return self.angle
+        delta = (self.angle - self.prev_angle + 180.0) % 360.0 - 180.0
+        return self.prev_angle + delta * alpha
+
+    def evaluate(self, zoom=1.0, alpha=1.0):
+        """Compute x, y for all bodies from the current angles.
+
+        `zoom` scales the orbits of top-level bodies only, so moons keep
+        their own distance around a zoomed parent. `alpha` interpolates
+        between the previous and current step for smooth rendering.
+        """
+        th = np.radians(self.interpolated_angle(alpha))
+        x = self.a * np.cos(th)
+        y = self.b * np.sin(th)
+        t = np.radians(self.tilt)
+        ct, st = np.cos(t), np.sin(t)
+        self.x = x*ct - y*st
+        self.y = x*st + y*ct
+
+        roots = self.parent < 0
+        self.x[roots] *= zoom
+        self.y[roots] *= zoom
+        for level in self._evaluation_levels():
+            self.x[level] += self.x[self.parent[level]]
+            self.y[level] += self.y[self.parent[level]]
+        return self.x, self.y
+
+    # ---------- Snapshots ----------
+    STATE_FIELDS = ("angle", "prev_angle", "speed", "a", "b", "tilt", "parent")
+
+    def get_state(self):
+        """Copy of the orbit state as arrays (see snapshot.py)."""
+        return {name: getattr(self, name).copy() for name in self.STATE_FIELDS}
+
+    def set_state(self, state):
+        for name in self.STATE_FIELDS:
+            setattr(self, name, np.array(state[name], dtype=getattr(self, name).dtype))
+        self.x = np.zeros(len(self))
+        self.y = np.zeros(len(self))
+        self._levels = None
@@ -0,0 +1,61 @@
+"""
+Orbit Guides
+------------
+Orbit paths computed once and drawn as a single canvas line each.
+
+- `orbit_points(a, b, tilt, resolution)` is cached, so every guide with
+  the same shape shares one coordinate tuple
+- `OrbitGuide` owns one polyline item; showing/hiding is a state flip
+  and following a moving parent is one canvas `move`
+"""
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=1024)
+def orbit_points(a, b=None, tilt=0.0, resolution=360):
+    """Closed ellipse as flat canvas coordinates (x0, y0, x1, y1, ...).
+
+    Canvas y grows downwards, so y is flipped compared to turtle space.
+    """
+    if b is None:
+        b = a
+    th = np.radians(np.arange(resolution + 1) * (360.0 / resolution))
+    x, y = a * np.cos(th), b * np.sin(th)
+    t = np.radians(tilt)
+    ct, st = np.cos(t), np.sin(t)
+    xy = np.empty(2 * (resolution + 1))
+    xy[0::2] = x*ct - y*st
+    xy[1::2] = -(x*st + y*ct)
+    return tuple(xy.tolist())
+
+
+class OrbitGuide:
+    def __init__(self, screen, a, b=None, tilt=0.0, color="#333333",
+                 width=1, resolution=360, visible=True):
+        self.cv = screen.getcanvas()
+        self.scale = (screen.xscale, screen.yscale)
+        self.center = (0.0, 0.0)
+        self.visible = visible
+        # floats keep the lru_cache key stable for ints and numpy scalars
+        points = orbit_points(float(a), None if b is None else float(b),
+                              float(tilt), resolution)
+        sx, sy = self.scale
+        if (sx, sy) != (1.0, 1.0):
+            points = [v * (sx if k % 2 == 0 else sy) for k, v in enumerate(points)]
+        self.item = self.cv.create_line(*points, fill=color, width=width,
+                                        state="normal" if visible else "hidden")
+
+    def show(self, visible):
+        if visible != self.visible:
+            self.visible = visible
+            self.cv.itemconfigure(self.item,
+                                  state="normal" if visible else "hidden")
+
+    def move_to(self, x, y):
+        """Centre the guide on turtle coordinates (x, y)."""
+        dx, dy = x - self.center[0], y - self.center[1]
+        if dx or dy:
+            self.center = (x, y)
+            self.cv.move(self.item, dx * self.scale[0], -dy * self.scale[1])
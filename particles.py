@@ -0,0 +1,172 @@
+"""
+Particles
+---------
+Array-backed particle pools for effects such as comet tails.
+
+- `ParticlePool` keeps a fixed number of particles in NumPy arrays
+  (position, velocity, age, lifetime, size). `emit()` writes a whole batch
+  into a ring of slots, so the oldest particles are recycled first;
+  `update(dt)` moves and ages every live particle in one pass, and a
+  particle is retired simply by outliving its lifetime (a mask, not a
+  list removal).
+- `Emitter` spawns particles from a moving source at a steady rate,
+  pushed away from a point (comet tails point away from the Sun) or along
+  a fixed direction.
+- `ParticleImage` draws a pool with the same few Tk calls however many
+  particles it holds: live particles are stamped into an alpha array
+  covering their bounding box (shrinking and fading with age) and shown
+  as one PNG image item. The PNG is paletted (one colour, 256 alpha
+  levels), so it is one byte per pixel to build, compress and decode.
+  One canvas oval per particle would cost a Tk call each, which does not
+  scale to thousands of particles.
+"""
+import base64
+import math
+import tkinter as tk
+
+import numpy as np
+
+from raster import dot_offsets, parse_color, png_bytes
+
+
+class ParticlePool:
+    def __init__(self, capacity, seed=None):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.age = np.full(capacity, np.inf)   # inf: slot is free
+        self.life = np.ones(capacity)
+        self.size = np.zeros(capacity)
+        self.head = 0                          # next slot to (re)use
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    @property
+    def alive(self):
+        return self.age < self.life
+
+    def emit(self, n, x, y, vx, vy, spread=0.0, life=1.0, size=3.0):
+        """Spawn n particles at (x, y) moving at (vx, vy) ± spread px/s.
+
+        Lifetimes are jittered by ±20% so a steady stream thins out
+        gradually instead of ending in a hard edge.
+        """
+        n = min(int(n), self.capacity)
+        if n <= 0:
+            return
+        slots = (self.head + np.arange(n)) % self.capacity
+        self.head = (self.head + n) % self.capacity
+        self.pos[slots] = x, y
+        self.vel[slots] = self.rng.normal((vx, vy), spread, (n, 2))
+        self.age[slots] = 0.0
+        self.life[slots] = life * self.rng.uniform(0.8, 1.2, n)
+        self.size[slots] = size
+
+    def update(self, dt, drag=0.0):
+        """Move and age every live particle by dt seconds."""
+        live = self.alive
+        self.pos[live] += self.vel[live] * dt
+        if drag:
+            self.vel[live] *= max(1.0 - drag * dt, 0.0)
+        self.age[live] += dt
+
+    def clear(self):
+        self.age[:] = np.inf
+
+
+class Emitter:
+    """Feeds `rate` particles per second into a pool from a moving source."""
+
+    def __init__(self, pool, rate, speed, spread=10.0, life=1.0, size=3.0,
+                 direction=(-1.0, 0.0)):
+        self.pool = pool
+        self.rate = rate
+        self.speed = speed
+        self.spread = spread
+        self.life = life
+        self.size = size
+        self.direction = direction
+        self._carry = 0.0  # fractional particles left over from earlier frames
+
+    def update(self, dt, x, y, away_from=None):
+        """Emit for dt seconds at (x, y), heading away from `away_from` if given."""
+        self._carry += self.rate * dt
+        n = int(self._carry)
+        self._carry -= n
+        dx, dy = self.direction
+        if away_from is not None:
+            dx, dy = x - away_from[0], y - away_from[1]
+            d = math.hypot(dx, dy) or 1.0
+            dx, dy = dx / d, dy / d
+        self.pool.emit(n, x, y, dx * self.speed, dy * self.speed,
+                       self.spread, self.life, self.size)
+
+
+class ParticleImage:
+    """Draws a pool as one canvas image, rebuilt each frame."""
+
+    def __init__(self, screen, pool, color, tag="particles"):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.pool = pool
+        self.palette = np.empty((256, 4), dtype=np.uint8)
+        self.palette[:, :3] = parse_color(color)
+        self.palette[:, 3] = np.arange(256)   # palette index = opacity
+        self.photo = tk.PhotoImage(width=1, height=1)  # keep a reference: Tk drops it otherwise
+        self._offsets = {}  # dot diameter -> pixel offsets
+        self.item = self.cv.create_image(0, 0, image=self.photo, anchor="nw",
+                                         state="hidden", tags=(tag,))
+        self.visible = False
+
+    def _show(self, on):
+        if on != self.visible:
+            self.cv.itemconfigure(self.item, state="normal" if on else "hidden")
+            self.visible = on
+
+    def draw(self, half_w, half_h):
+        """Stamp the live particles inside the view (±half_w, ±half_h)."""
+        pool = self.pool
+        live = np.flatnonzero(pool.alive)
+        fade = 1.0 - pool.age[live] / pool.life[live]
+        cx = pool.pos[live, 0] * self.screen.xscale
+        cy = -pool.pos[live, 1] * self.screen.yscale
+        diameter = np.maximum(np.rint(pool.size[live] * (0.3 + 0.7 * fade)), 1).astype(int)
+        inside = (np.abs(cx) < half_w) & (np.abs(cy) < half_h)
+        if not inside.any():
+            self._show(False)
+            return
+        cx, cy, fade, diameter = cx[inside], cy[inside], fade[inside], diameter[inside]
+        pad = int(diameter.max())
+        x0 = int(max(cx.min() - pad, -half_w))
+        y0 = int(max(cy.min() - pad, -half_h))
+        w = int(min(cx.max() + pad, half_w)) - x0 + 1
+        h = int(min(cy.max() + pad, half_h)) - y0 + 1
+
+        alpha = np.zeros(h * w, dtype=np.uint8)   # flat: one index per pixel
+        px = np.rint(cx).astype(int) - x0
+        py = np.rint(cy).astype(int) - y0
+        a = (255 * fade).astype(np.uint8)
+        for d in np.unique(diameter).tolist():
+            rows = np.flatnonzero(diameter == d)
+            # brightest last, so overlapping dots keep the youngest particle
+            rows = rows[np.argsort(a[rows], kind="stable")]
+            if d not in self._offsets:
+                self._offsets[d] = dot_offsets(d)
+            ox, oy = self._offsets[d]
+            x = (px[rows, None] + ox).ravel()
+            y = (py[rows, None] + oy).ravel()
+            v = np.repeat(a[rows], len(ox))
+            keep = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+            index = y[keep] * w + x[keep]
+            alpha[index] = np.maximum(alpha[index], v[keep])
+        alpha = alpha.reshape(h, w)
+
+        png = png_bytes(alpha, level=1, palette=self.palette)
+        self.photo.configure(data=base64.b64encode(png), format="png")
+        self.cv.coords(self.item, x0, y0)
+        self._show(True)
+
+    def clear(self):
+        self._show(False)
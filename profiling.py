@@ -0,0 +1,170 @@
+"""
+Profiling
+---------
+Lightweight per-phase frame timing for the animation loops.
+
+    frame_timer.begin()
+    ...physics...
+    frame_timer.lap("physics")
+    ...labels...
+    frame_timer.lap("labels")
+    frame_timer.end()
+
+Each `lap(name)` charges the time since the previous lap (or `begin`)
+to `name`. The cost is one `perf_counter()` call per lap, so the timer
+stays on in normal runs; benchmark.py reads the totals.
+
+The timer also keeps a rolling window of recent frames for live stats:
+frame-period and work-time percentiles, per-phase means and the number
+of late ("dropped") timer ticks. `StatsHUD` shows them on the canvas and
+`dump()` writes them to JSON and CSV.
+"""
+import csv
+import json
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+
+class PhaseTimer:
+    def __init__(self, now=time.perf_counter, window=600, target_ms=None):
+        self.now = now
+        self.totals = defaultdict(float)  # seconds per phase, all frames
+        self.frames = 0
+        self.last_frame = {}              # seconds per phase, latest frame
+        self.target_ms = target_ms        # scheduled frame period, if known
+        self.history = deque(maxlen=window)  # recent frames (dict rows)
+        self.dropped = 0                  # ticks later than 1.5x the target
+        self._current = {}
+        self._mark = None
+        self._frame_start = None
+        self._period = None
+
+    def begin(self):
+        t = self.now()
+        self._period = None if self._frame_start is None else t - self._frame_start
+        self._frame_start = t
+        if (self._period is not None and self.target_ms
+                and self._period * 1000.0 > 1.5 * self.target_ms):
+            self.dropped += 1
+        self._current = {}
+        self._mark = t
+
+    def lap(self, phase):
+        t = self.now()
+        self._current[phase] = self._current.get(phase, 0.0) + (t - self._mark)
+        self._mark = t
+
+    def end(self):
+        for phase, seconds in self._current.items():
+            self.totals[phase] += seconds
+        self.last_frame = self._current
+        self.frames += 1
+        row = {"frame": self.frames,
+               "period_ms": None if self._period is None else self._period * 1000.0,
+               "work_ms": sum(self._current.values()) * 1000.0}
+        row.update((phase, s * 1000.0) for phase, s in self._current.items())
+        self.history.append(row)
+
+    def reset(self):
+        self.totals.clear()
+        self.frames = 0
+        self.history.clear()
+        self.dropped = 0
+        self._frame_start = None
+
+    def average_ms(self):
+        """Mean milliseconds per frame for each phase."""
+        n = max(self.frames, 1)
+        return {phase: 1000.0 * total / n for phase, total in self.totals.items()}
+
+    # ---------- Rolling statistics ----------
+    def percentiles(self, key="period_ms", q=(50, 95, 99)):
+        values = [row[key] for row in self.history if row.get(key) is not None]
+        if not values:
+            return {p: 0.0 for p in q}
+        return dict(zip(q, np.percentile(values, q)))
+
+    def recent_phase_ms(self):
+        """Mean ms per phase over the rolling window."""
+        sums, n = defaultdict(float), max(len(self.history), 1)
+        for row in self.history:
+            for key, value in row.items():
+                if key not in ("frame", "period_ms", "work_ms"):
+                    sums[key] += value
+        return {phase: total / n for phase, total in sums.items()}
+
+    def summary(self, item_count=None):
+        return {
+            "frames": self.frames,
+            "window": len(self.history),
+            "target_ms": self.target_ms,
+            "dropped_timers": self.dropped,
+            "canvas_items": item_count,
+            "period_ms": {f"p{k}": v for k, v in self.percentiles("period_ms").items()},
+            "work_ms": {f"p{k}": v for k, v in self.percentiles("work_ms").items()},
+            "phases_ms": self.recent_phase_ms(),
+        }
+
+    def dump(self, basename=None, item_count=None):
+        """Write <basename>.json (summary + frames) and <basename>.csv (frames)."""
+        if basename is None:
+            basename = time.strftime("frame_stats_%Y%m%d_%H%M%S")
+        rows = list(self.history)
+        with open(basename + ".json", "w") as f:
+            json.dump({"summary": self.summary(item_count), "frames": rows}, f, indent=2)
+        fields = ["frame", "period_ms", "work_ms"]
+        for row in rows:
+            fields.extend(k for k in row if k not in fields)
+        with open(basename + ".csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        return basename
+
+
+class StatsHUD:
+    """Togglable on-canvas text overlay with the timer's live statistics."""
+
+    def __init__(self, screen, timer, refresh_s=0.5, visible=False):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.timer = timer
+        self.refresh_s = refresh_s
+        self.visible = visible
+        self._last = 0.0
+        self.item = self.cv.create_text(0, 0, text="", anchor="nw", fill="#7CFC00",
+                                        font=("Consolas", 9, "normal"),
+                                        state="normal" if visible else "hidden")
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.cv.itemconfigure(self.item, state="normal" if self.visible else "hidden")
+        self._last = 0.0
+        self.update()
+
+    def item_count(self):
+        return len(self.cv.find_all())
+
+    def update(self):
+        """Refresh the text (rate-limited); call once per frame."""
+        if not self.visible:
+            return
+        t = time.perf_counter()
+        if t - self._last < self.refresh_s:
+            return
+        self._last = t
+        s = self.timer.summary(self.item_count())
+        lines = ["frame  p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f} ms".format(**s["period_ms"]),
+                 "work   p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f} ms".format(**s["work_ms"])]
+        lines += [f"{phase:8s} {ms:6.2f} ms" for phase, ms in s["phases_ms"].items()]
+        lines += [f"items {s['canvas_items']}   dropped {s['dropped_timers']}"]
+        w, h = self.screen.window_width(), self.screen.window_height()
+        self.cv.coords(self.item, -w / 2 + 10, -h / 2 + 10)
+        self.cv.itemconfigure(self.item, text="\n".join(lines))
+        self.cv.tag_raise(self.item)
+
+    def dump(self):
+        name = self.timer.dump(item_count=self.item_count())
+        print(f"Frame stats written to {name}.json / {name}.csv")
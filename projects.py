@@ -2,8 +2,29 @@ import tkinter as tk
 from tkinter import ttk
 import turtle
 import math
+import os
 import random
 import time
+import numpy as np
+from orbit_engine import OrbitEngine
+from labels import Label
+from trails import Trail
+from starfield import DriftingStars, FLAT_LAYERS, PARALLAX_LAYERS
+from clock import FixedStepClock, FrameScheduler
+from nbody import NBodySystem
+from profiling import PhaseTimer, StatsHUD
+from kepler import KeplerMotion, KeplerOrbits, compress_radius
+from catalog import ASTEROIDS_CAT, Catalog
+from scenes import HELIX_DECORATIONS, HELIX_PLANETS
+from bodies import BodyStore
+from renderers import RENDERERS
+from worker import SimulationWorker
+from spatial import GridIndex, suppress_overlaps, visible_mask
+from snapshot import Timeline, nest, section
+from recording import from_argv
+from collisions import Highlights, SweepAndPrune
+from particles import Emitter, ParticleImage, ParticlePool
+from decorations import Decorations
 
 # ----------------- Tkinter Setup -----------------
 root = tk.Tk()
@@ -33,13 +54,56 @@ zoom_var = tk.DoubleVar(value=1.0)
 ttk.Scale(control_frame, from_=0.5, to=2.0, variable=zoom_var,
           orient=tk.HORIZONTAL, length=180).pack()
 
+# Target frame rate (frames run on absolute deadlines, see clock.py)
+ttk.Label(control_frame, text="Target FPS").pack(pady=5)
+fps_var = tk.DoubleVar(value=60)
+ttk.Scale(control_frame, from_=15, to=120, variable=fps_var, orient=tk.HORIZONTAL,
+          length=180, command=lambda value: set_target_fps(value)).pack()
+
 # Trail toggle
 show_trails_var = tk.BooleanVar(value=True)
 ttk.Checkbutton(control_frame, text="Show Trails", variable=show_trails_var).pack(pady=5)
 
+# Parallax stars toggle (several depth layers drifting at different speeds)
+parallax_var = tk.BooleanVar(value=False)
+ttk.Checkbutton(control_frame, text="Parallax Stars", variable=parallax_var,
+                command=lambda: stars.set_layers(
+                    PARALLAX_LAYERS if parallax_var.get() else FLAT_LAYERS)).pack(pady=5)
+
+# N-body gravity toggle (Sun, planets and an asteroid belt attract each other)
+gravity_var = tk.BooleanVar(value=False)
+ttk.Checkbutton(control_frame, text="N-body Gravity", variable=gravity_var,
+                command=lambda: toggle_gravity()).pack(pady=5)
+
+# Real orbital elements (Kepler's equation, positions for any date)
+kepler_var = tk.BooleanVar(value=False)
+ttk.Checkbutton(control_frame, text="Real Orbits (Kepler)", variable=kepler_var,
+                command=lambda: toggle_kepler()).pack(pady=5)
+
+# Run the N-body / Kepler physics in another process (shared-memory positions)
+worker_var = tk.BooleanVar(value=False)
+ttk.Checkbutton(control_frame, text="Physics in Worker Process", variable=worker_var,
+                command=lambda: restart_worker()).pack(pady=5)
+
+# Rendering backend: turtles, or one canvas oval per body updated in bulk
+ttk.Label(control_frame, text="Renderer").pack(pady=5)
+renderer_var = tk.StringVar(value="canvas")
+for backend in RENDERERS:
+    ttk.Radiobutton(control_frame, text=backend.title(), value=backend,
+                    variable=renderer_var,
+                    command=lambda: set_renderer(renderer_var.get())).pack()
+
+# Rings around bodies in a close approach / collision
+highlight_var = tk.BooleanVar(value=True)
+ttk.Checkbutton(control_frame, text="Highlight Encounters",
+                variable=highlight_var).pack(pady=5)
+
 # Pause/Resume
 paused = tk.BooleanVar(value=False)
 def toggle_pause():
+    if player is not None:
+        player.toggle_pause()  # replaying: pause the playback
+        return
     paused.set(not paused.get())
 pause_btn = ttk.Button(control_frame, text="Pause/Resume", command=toggle_pause)
 pause_btn.pack(pady=10)
@@ -47,16 +111,31 @@ pause_btn.pack(pady=10)
 # Reset Trails
 def reset_trails():
     for p in planets:
-        p["trail"].clear()
-        p["trail_t"].clear()
+        p.trail.clear()
 reset_btn = ttk.Button(control_frame, text="Reset Trails", command=reset_trails)
 reset_btn.pack(pady=5)
 
+# Snapshots and seeking (buttons + F5/F9 and [ / ] keys)
+snapshot_frame = ttk.Frame(control_frame)
+snapshot_frame.pack(pady=5)
+for column, (text, action) in enumerate([
+        ("Save", lambda: jump(timeline.save, restart=False)),
+        ("Load", lambda: jump(timeline.load)),
+        ("« 1 min", lambda: jump(lambda: timeline.seek_seconds(-60))),
+        ("1 min »", lambda: jump(lambda: timeline.seek_seconds(60)))]):
+    ttk.Button(snapshot_frame, text=text, width=7, command=action).grid(row=0, column=column)
+seek_label = ttk.Label(snapshot_frame, text="")  # N-body fast-forward progress
+seek_label.grid(row=1, column=0, columnspan=4)
+
 # Info panel
 info_label = tk.Label(control_frame, text="Click a planet to see info",
                       justify="left", bg="black", fg="white", width=35, height=20,
                       font=("Consolas", 9), anchor="nw")
 info_label.pack(pady=10, fill=tk.BOTH)
+encounter_label = tk.Label(control_frame, text="No encounters yet", justify="left",
+                           bg="black", fg="#00E5FF", width=35, font=("Consolas", 9),
+                           anchor="w")
+encounter_label.pack(fill=tk.X)
 
 # ----------------- Sun -----------------
 sun = turtle.RawTurtle(screen)
@@ -67,209 +146,638 @@ sun.penup()
 sun.goto(0, 0)
 
 # ----------------- Sun Tail -----------------
-sun_tail = turtle.RawTurtle(screen)
-sun_tail.hideturtle()
-sun_tail.penup()
-sun_tail.color("orange")
-sun_trail = []
+# Particles stream back along -x (the Sun moves forward along the helix)
+SUN_TAIL_PARTICLES = 1000
+sun_tail = Emitter(ParticlePool(SUN_TAIL_PARTICLES), rate=300, speed=120,
+                   spread=12, life=2.0, size=12)
+sun_tail_image = ParticleImage(screen, sun_tail.pool, "orange")  # one image item
 
 # ----------------- Stars -----------------
-stars = []
-for _ in range(150):
-    x, y = random.randint(-500, 500), random.randint(-350, 350)
-    stars.append([x, y])   # mutable list for movement
-star_t = turtle.RawTurtle(screen)
-star_t.hideturtle()
-star_t.penup()
+STAR_COUNT = 150
+stars = DriftingStars(screen, STAR_COUNT, 1000, 700)  # ✅ Persistent star items
 
 # ----------------- Planet Data -----------------
-planet_data = [
-    ("Mercury", "gray", 40, 4.7, 4879,   57900000,   47.4),
-    ("Venus", "orange", 70, 3.5, 12104,  108200000,  35.0),
-    ("Earth", "blue", 100, 3.0, 12742,  149600000,  29.8),
-    ("Mars", "red", 150, 2.4, 6779,   227900000,  24.1),
-    ("Jupiter", "brown", 220, 1.3, 139820, 778500000, 13.1),
-    ("Saturn", "gold", 280, 1.0, 116460, 1433000000, 9.7),
-    ("Uranus", "light blue", 340, 0.7, 50724, 2877000000, 6.8),
-    ("Neptune", "purple", 400, 0.5, 49244, 4503000000, 5.4),
-]
-
-planets = []
-for name, color, radius, speed, diameter, distance, velocity in planet_data:
-    t = turtle.RawTurtle(screen)
-    t.shape("circle")
-    t.color(color)
-    t.shapesize(0.6)
-    t.penup()
-
-    trail_t = turtle.RawTurtle(screen)  # ✅ Separate turtle for trails
-    trail_t.hideturtle()
-    trail_t.penup()
-    trail_t.color(color)
-
-    label = turtle.RawTurtle(screen)  # ✅ Label turtle only for names
-    label.hideturtle()
-    label.color("white")
-    label.penup()
-
-    planets.append({
-        "turtle": t,
-        "trail_t": trail_t,
-        "label": label,
-        "name": name,
-        "radius": radius,
-        "angle": 0,
-        "speed": speed,
-        "diameter": diameter,
-        "distance": distance,
-        "velocity": velocity,
-        "trail": []
-    })
+TRAIL_LENGTH = 50  # dots per planet trail (ring buffer, fixed item pool)
+PLANET_RADIUS = 6  # drawn radii in px
+MOON_RADIUS = 3
+SUN_RADIUS = 20
+BELT_RADIUS = 1
+LABEL_MIN_PX = 25   # LOD: no label when the orbit is smaller than this on screen
+MOON_MIN_PX = 8     # LOD: hide a moon whose orbit would be smaller than this zoomed
+LABEL_CHAR_PX = 5   # rough label size (Arial 7) for collision tests
+LABEL_HEIGHT_PX = 10
+
+engine = OrbitEngine()  # ✅ Orbit state for all bodies in NumPy arrays
+# ✅ Planet facts in columns; turtles/labels/trails kept apart as display handles
+planets = BodyStore(handles=("label", "trail"),
+                    name=object, orbit=np.intp, diameter=np.int64,
+                    distance=np.int64, velocity=float, body=np.intp)
+pick_radius = []        # drawn radius per engine body, for click/hover picking
+renderer = RENDERERS[renderer_var.get()](screen)  # draws every engine body
+
+def add_body_sprite(index, color, radius):
+    assert renderer.add(color, radius) == index  # renderer ids = engine indices
+    pick_radius.append(radius)
+
+def add_planet(name, color, radius, speed, diameter, distance, velocity):
+    label = Label(screen, font=("Arial", 7, "normal"))  # ✅ Name label, created once
+
+    p = planets.add(
+        label=label,
+        name=name,
+        orbit=engine.add_body(radius, speed=speed),  # index into the engine arrays
+        diameter=diameter,
+        distance=distance,
+        velocity=velocity,
+        trail=Trail(screen, TRAIL_LENGTH, color)  # ✅ Ring-buffer trail
+    )
+    add_body_sprite(p.orbit, color, PLANET_RADIUS)
+
+for row in HELIX_PLANETS:  # table in data/planets.json
+    add_planet(*row)
 
 # ----------------- Moon for Earth -----------------
+earth_index = planets.find("name", "Earth").orbit
 moon = {
-    "turtle": turtle.RawTurtle(screen),
-    "angle": 0,
-    "speed": 12,
-    "radius": 15,
+    "index": engine.add_body(15, speed=math.degrees(12), parent=earth_index),
 }
-moon["turtle"].shape("circle")
-moon["turtle"].color("white")
-moon["turtle"].shapesize(0.3)
-moon["turtle"].penup()
+add_body_sprite(moon["index"], "white", MOON_RADIUS)
 
-# ----------------- Saturn Rings -----------------
-ring_t = turtle.RawTurtle(screen)
-ring_t.hideturtle()
-ring_t.color("gold")
-ring_t.width(1)
+# ----------------- Decorations (rings, glows) -----------------
+# Built once from the table in data/planets.json, then only moved
+decorations = Decorations(screen)
+for body, kind, color, radius, width in HELIX_DECORATIONS:
+    decorations.add(planets.find("name", body).orbit, kind, color, radius, width)
 
 # ----------------- Comet -----------------
+COMET_TAIL_PARTICLES = 4000
 comet = {
     "turtle": turtle.RawTurtle(screen),
     "x": -500,
     "y": random.randint(-200, 200),
     "speed": 3,
-    "trail": []
+    # tail particles blown away from the Sun
+    "tail": Emitter(ParticlePool(COMET_TAIL_PARTICLES), rate=1500, speed=60,
+                    spread=15, life=2.5, size=4),
 }
 comet["turtle"].shape("circle")
 comet["turtle"].color("white")
 comet["turtle"].shapesize(0.4)
 comet["turtle"].penup()
+comet_tail_image = ParticleImage(screen, comet["tail"].pool, "#BFEFFF")
+COMET_RADIUS = 4
+
+def move_comet(dt):
+    """Fly the comet left to right; it comes back in at a new height."""
+    comet["x"] += comet["speed"] * 60 * dt  # speed is px per 1/60 s
+    if comet["x"] > 520:
+        comet["x"], comet["y"] = -520, random.randint(-200, 200)
+
+def update_tails(dt):
+    """Emit, move and retire the tail particles (dt in simulated seconds)."""
+    sun_tail.update(dt, 0, 0)
+    sun_tail.pool.update(dt)
+    comet["tail"].update(dt, comet["x"], comet["y"], away_from=(0, 0))
+    comet["tail"].pool.update(dt)
+
+# ----------------- N-body Gravity (optional) -----------------
+BELT_PARTICLES = 2000      # massless test particles between Mars and Jupiter
+SUN_GM = 2741.0            # Earth's 100 px orbit takes about two minutes
+BH_THETA = 0.6             # Barnes-Hut opening angle
+gravity = None             # NBodySystem while the mode is on
+belt_dots = []
+belt_xy = None             # (bx, by) while belt dots are shown, for picking
+belt_on = np.zeros(0, dtype=bool)  # belt dots currently placed inside the view
+
+def view_half_size():
+    return screen.window_width() / 2, screen.window_height() / 2
+
+def show_belt(bx, by):
+    """Place the belt dots (grown on demand) at screen positions bx, by."""
+    global belt_xy, belt_on
+    belt_xy = (bx, by)
+    while len(belt_dots) < len(bx):
+        belt_dots.append(canvas.create_oval(0, 0, 0, 0, fill="#999999",
+                                            outline="", tags=("belt",)))
+    if len(belt_on) < len(bx):
+        belt_on = np.concatenate([belt_on, np.zeros(len(bx) - len(belt_on), dtype=bool)])
+    # Culling: off-screen dots are parked once, then left alone
+    on = visible_mask(bx, by, BELT_RADIUS, *view_half_size())
+    for k in np.flatnonzero(on):
+        canvas.coords(belt_dots[k], bx[k] - 1, -by[k] - 1, bx[k] + 1, -by[k] + 1)
+    for k in np.flatnonzero(belt_on[:len(bx)] & ~on):
+        canvas.coords(belt_dots[k], -9999, -9999, -9999, -9999)
+    belt_on[:len(bx)] = on
+    canvas.itemconfigure("belt", state="normal")
+
+def hide_belt():
+    global belt_xy
+    belt_xy = None
+    canvas.itemconfigure("belt", state="hidden")
+
+def toggle_gravity():
+    global gravity, gravity_backlog
+    gravity_backlog = 0
+    if not gravity_var.get():
+        gravity = None
+        hide_belt()
+        set_checkpoint_interval()
+        restart_worker()
+        return
+    gravity = NBodySystem(theta=BH_THETA)
+    gravity.add_bodies([0, 0], [0, 0], SUN_GM)  # body 0 is the Sun
+    i = planets["orbit"]
+    # mass scaled from Jupiter (about 1/1000 of the Sun) by volume
+    mass = SUN_GM * 1e-3 * (planets["diameter"] / 139820) ** 3
+    planets["body"][:] = gravity.add_orbiting(0, engine.a[i], engine.angle[i], mass)
+    rng = np.random.default_rng()
+    gravity.add_orbiting(0, rng.uniform(170, 210, BELT_PARTICLES),
+                         rng.uniform(0, 360, BELT_PARTICLES), 0.0)
+    set_checkpoint_interval()
+    restart_worker()
+
+def gravity_positions(xs, ys, zoom):
+    """Planet/moon positions from the N-body state; also places the belt."""
+    rel = (gravity.pos - gravity.pos[0]) * zoom  # relative to the Sun
+    xs, ys = xs.copy(), ys.copy()
+    moon_dx = xs[moon["index"]] - xs[earth_index]
+    moon_dy = ys[moon["index"]] - ys[earth_index]
+    xs[planets["orbit"]], ys[planets["orbit"]] = rel[planets["body"]].T
+    xs[moon["index"]] = xs[earth_index] + moon_dx
+    ys[moon["index"]] = ys[earth_index] + moon_dy
+    belt = rel[len(planets) + 1:]
+    show_belt(belt[:, 0], belt[:, 1])
+    return xs, ys
+
+# ----------------- Kepler Orbits (optional) -----------------
+KEPLER_ASTEROIDS = 2000    # synthetic main-belt asteroids
+DAYS_PER_SECOND = 30.0     # simulated days per second at speed 1
+kepler = KeplerOrbits.planets()
+# planets are matched to their elements by name, not by table order
+kepler_rows = np.array([kepler.names.index(name) for name in planets["name"]])
+first_asteroid = len(kepler)
+if os.path.exists(ASTEROIDS_CAT):
+    # memory-mapped catalog (python catalog.py asteroids): only these rows are read
+    kepler.add_catalog(Catalog(ASTEROIDS_CAT), 0, KEPLER_ASTEROIDS)
+else:
+    kepler.add_random_asteroids(KEPLER_ASTEROIDS)
+kepler_day = 0.0           # days since J2000
+
+def toggle_kepler():
+    hide_belt()
+    restart_worker()
+
+def kepler_positions(xs, ys, zoom):
+    """Planet/moon positions for the current date; also places asteroids."""
+    if sim_worker is not None:
+        au = sim_worker.latest(sim_worker.slots[0])  # AU positions from the worker
+        kx, ky = au[:, 0], au[:, 1]
+    else:
+        kx, ky, _ = kepler.positions(kepler_day)
+    kx, ky = compress_radius(kx, ky)
+    kx, ky = kx * zoom, ky * zoom
+    xs, ys = xs.copy(), ys.copy()
+    moon_dx = xs[moon["index"]] - xs[earth_index]
+    moon_dy = ys[moon["index"]] - ys[earth_index]
+    xs[planets["orbit"]], ys[planets["orbit"]] = kx[kepler_rows], ky[kepler_rows]
+    xs[moon["index"]] = xs[earth_index] + moon_dx
+    ys[moon["index"]] = ys[earth_index] + moon_dy
+    show_belt(kx[first_asteroid:], ky[first_asteroid:])
+    return xs, ys
+
+# ----------------- Physics Worker (optional) -----------------
+sim_worker = None          # SimulationWorker running gravity or Kepler motion
+worker_day = 0.0           # kepler_day when the worker started
+
+def restart_worker():
+    """(Re)start the worker for the active mode, or stop it.
+
+    A running N-body worker hands its positions and velocities back first,
+    so the simulation carries on where the worker left it.
+    """
+    global sim_worker, worker_day
+    if sim_worker is not None:
+        if sim_worker.sim is gravity:
+            state = sim_worker.latest_state()
+            if state is not None:
+                gravity.set_state(state[:, :2], state[:, 2:])
+        sim_worker.stop()
+        sim_worker = None
+    if not worker_var.get():
+        return
+    if gravity is not None:
+        if gravity_backlog:
+            return  # started once the seek fast-forward has caught up
+        sim_worker = SimulationWorker(gravity, PHYSICS_DT)
+    elif kepler_var.get():
+        worker_day = kepler_day
+        sim_worker = SimulationWorker(KeplerMotion(kepler, kepler_day, DAYS_PER_SECOND),
+                                      PHYSICS_DT)
 
 # ----------------- Simulation Variables -----------------
 sun_speed = 40
 sun_x = 0
-last_time = time.time()
+star_dx = 0.0  # star drift not yet drawn (frames that skip drawing)
+scheduler = FrameScheduler(fps_var.get())  # frames on absolute deadlines
+frame_timer = PhaseTimer(target_ms=1000 / fps_var.get())  # per-phase frame timings
+hud = StatsHUD(screen, frame_timer)       # live overlay: 'h' toggles, 'p' saves
+root.bind("<KeyPress-h>", lambda event: hud.toggle())
+root.bind("<KeyPress-p>", lambda event: hud.dump())
+PHYSICS_DT = 1 / 60  # fixed physics timestep (seconds)
+clock = FixedStepClock(step=PHYSICS_DT, max_steps=5)
+
+# ----------------- Snapshots -----------------
+# Orbits, Sun drift, Kepler date, comet, trails, the sliders and (while the
+# mode is on) the N-body gravity state are saved; the tail particles are not.
+# While N-body runs in the worker process its velocities live over there,
+# so the snapshot controls are off in that case.
+#
+# A Barnes-Hut step takes milliseconds, so a seek does not step N-body on
+# the spot: the steps go into gravity_backlog and are run a few per frame
+# (FAST_FORWARD_MS each) while the planets and belt visibly catch up.
+# Checkpoints are also taken more often while N-body is on, which bounds
+# the backlog a backward seek adds.
+CHECKPOINT_STEPS = 1800          # every 30 s
+GRAVITY_CHECKPOINT_STEPS = 300   # every 5 s while N-body is on
+FAST_FORWARD_MS = 20             # N-body catch-up time per frame
+gravity_backlog = 0              # N-body steps a seek still owes
+
+def set_checkpoint_interval():
+    timeline.history.every = CHECKPOINT_STEPS if gravity is None else GRAVITY_CHECKPOINT_STEPS
+
+def fast_forward_gravity(step):
+    """Run backlog steps of `step` seconds for up to FAST_FORWARD_MS."""
+    global gravity_backlog
+    deadline = time.perf_counter() + FAST_FORWARD_MS / 1000
+    while gravity_backlog and time.perf_counter() < deadline:
+        gravity.step(step)
+        gravity_backlog -= 1
+    if gravity_backlog:
+        seek_label.config(text=f"N-body catching up: {gravity_backlog} steps to go")
+        return
+    seek_label.config(text="")
+    if worker_var.get() and sim_worker is None:
+        restart_worker()  # deferred while the backlog ran
+def capture_state():
+    state = {**nest("engine", engine.get_state()),
+             "sun_x": sun_x, "kepler_day": kepler_day,
+             "comet_x": comet["x"], "comet_y": comet["y"], "comet_speed": comet["speed"],
+             "speed": speed_var.get(), "zoom": zoom_var.get()}
+    if gravity is not None:
+        state.update(nest("gravity", {"pos": gravity.pos, "vel": gravity.vel,
+                                      "mass": gravity.mass, "body": planets["body"],
+                                      "backlog": gravity_backlog}))
+    for p in planets:
+        state.update(nest(f"trail{p.row}", p.trail.get_state()))
+    return state
+
+def restore_gravity(state):
+    """N-body state from a snapshot; the mode follows the snapshot."""
+    global gravity, gravity_backlog
+    saved = section(state, "gravity")
+    gravity_var.set(bool(saved))
+    gravity_backlog = int(saved.get("backlog", 0))
+    if not saved:
+        gravity = None
+        hide_belt()
+    else:
+        gravity = NBodySystem(theta=BH_THETA)
+        gravity.add_bodies(saved["pos"], saved["vel"], saved["mass"])
+        planets["body"][:] = saved["body"]
+    set_checkpoint_interval()
+
+def restore_state(state):
+    global sun_x, kepler_day
+    engine.set_state(section(state, "engine"))
+    restore_gravity(state)
+    for p in planets:
+        p.trail.set_state(section(state, f"trail{p.row}"))
+    sun_x, kepler_day = state["sun_x"], state["kepler_day"]
+    comet["x"], comet["y"], comet["speed"] = state["comet_x"], state["comet_y"], state["comet_speed"]
+    speed_var.set(state["speed"])
+    zoom_var.set(state["zoom"])
+
+def advance_headless(n):
+    """n physics steps without drawing (trails restart from the new position).
+
+    N-body steps are only queued; fast_forward_gravity() runs them.
+    """
+    global sun_x, kepler_day, gravity_backlog
+    speed_mult = speed_var.get()
+    for _ in range(n):
+        engine.step(PHYSICS_DT * speed_mult)
+    if gravity is not None:
+        gravity_backlog += n
+    sun_x += sun_speed * n * PHYSICS_DT * speed_mult
+    move_comet(n * PHYSICS_DT * speed_mult)
+    if kepler_var.get():
+        kepler_day += n * PHYSICS_DT * speed_mult * DAYS_PER_SECOND
+    reset_trails()
+
+def jump(action, restart=True):
+    """Run a save/load/seek; a running worker restarts from the new state."""
+    if gravity is not None and sim_worker is not None:
+        print("Snapshots are off while N-body runs in the worker process")
+        return
+    action()
+    if restart and worker_var.get():
+        restart_worker()
+
+timeline = Timeline(clock, capture_state, restore_state, advance_headless,
+                    path="snapshot_projects.bin", every=CHECKPOINT_STEPS)
+root.bind("<F5>", lambda event: jump(timeline.save, restart=False))
+root.bind("<F9>", lambda event: jump(timeline.load))
+root.bind("<bracketleft>", lambda event: jump(lambda: timeline.seek_seconds(-60)))
+root.bind("<bracketright>", lambda event: jump(lambda: timeline.seek_seconds(60)))
+
+# ----------------- Record / Replay -----------------
+# python projects.py --record run.rec | --replay run.rec (see recording.py).
+# The engine bodies and the control values are recorded; belt dots are not.
+recorder, player = from_argv()
+recorded_vars = {"speed": speed_var, "zoom": zoom_var, "paused": paused,
+                 "show_trails": show_trails_var}
+if recorder is not None:
+    for name, var in recorded_vars.items():
+        recorder.event(name, var.get())
+        var.trace_add("write", lambda *_, name=name, var=var: recorder.event(name, var.get()))
+
+def replay_event(name, value):
+    recorded_vars[name].set(value)
+
+if player is not None:  # replaying: the keys drive the playback instead
+    root.bind("<space>", lambda event: player.toggle_pause())
+    root.bind("<Up>", lambda event: player.set_speed(player.speed * 2))
+    root.bind("<Down>", lambda event: player.set_speed(player.speed / 2))
+    root.bind("<bracketleft>", lambda event: player.seek(player.t - 10))
+    root.bind("<bracketright>", lambda event: player.seek(player.t + 10))
+
+def set_target_fps(value):
+    fps = round(float(value))
+    scheduler.set_fps(fps)
+    frame_timer.target_ms = 1000 / fps
+
+# ----------------- Picking (click info + hover tooltips) -----------------
+# Targets are the engine bodies, then the Sun, then any visible belt dots.
+# The grid is rebuilt at most once per frame, on the first click/hover.
+picker = GridIndex()
+pick_source = None  # (xs, ys, belt_xy) of the latest frame, not yet indexed
+hover_label = Label(screen, font=("Arial", 8, "normal"), color="#FFFF99")
+hover_label.show(False)
+
+def pick(x, y):
+    """Target index under turtle coordinates (x, y), or -1."""
+    global pick_source
+    if pick_source is not None:
+        xs, ys, belt = pick_source
+        px, py, pr = [xs, [0.0]], [ys, [0.0]], [pick_radius, [SUN_RADIUS]]
+        if belt is not None:
+            px.append(belt[0])
+            py.append(belt[1])
+            pr.append(np.full(len(belt[0]), BELT_RADIUS))
+        picker.rebuild(np.concatenate(px), np.concatenate(py), np.concatenate(pr))
+        pick_source = None
+    return picker.nearest(x, y)
+
+def describe(k):
+    """(tooltip, info panel text) for a picked target."""
+    n = len(pick_radius)
+    if k < n:
+        p = planets.find("orbit", k)
+        if p is None:
+            return "Moon", f"Moon of Earth\nAngle: {engine.angle[k]:.1f}°"
+        return p.name, (f"Planet: {p.name}\n"
+                        f"Diameter: {p.diameter:,} km\n"
+                        f"Distance: {p.distance:,} km\n"
+                        f"Orbital Speed: {p.velocity} km/s\n"
+                        f"Angle: {engine.angle[k]:.1f}°")
+    if k == n:
+        return "Sun", "Sun"
+    b = k - n - 1
+    if gravity is not None:
+        return f"Belt particle {b}", f"Belt particle {b}\n(N-body test particle)"
+    j = first_asteroid + b
+    return f"Asteroid {b}", (f"Asteroid {b}\n"
+                             f"Semi-major axis: {kepler.a[j]:.2f} AU\n"
+                             f"Eccentricity: {kepler.e[j]:.3f}\n"
+                             f"Inclination: {kepler.i[j]:.1f}°")
 
-# ----------------- Planet Click Info -----------------
 def planet_info(x, y):
-    for p in planets:
-        px, py = p["turtle"].pos()
-        if abs(x - px) < 10 and abs(y - py) < 10:
-            info = (f"Planet: {p['name']}\n"
-                    f"Diameter: {p['diameter']:,} km\n"
-                    f"Distance: {p['distance']:,} km\n"
-                    f"Orbital Speed: {p['velocity']} km/s\n"
-                    f"Angle: {p['angle']:.1f}°")
-            info_label.config(text=info)
-            return
-    info_label.config(text="Click a planet to see info")
+    k = pick(x, y)
+    info_label.config(text=describe(k)[1] if k >= 0 else "Click a planet to see info")
+
+def hover_info(event):
+    x = canvas.canvasx(event.x) / screen.xscale
+    y = -canvas.canvasy(event.y) / screen.yscale
+    k = pick(x, y)
+    if k < 0:
+        hover_label.show(False)
+        return
+    hover_label.place(x + 10, y + 10, describe(k)[0])
+    canvas.tag_raise(hover_label.item)
 
 screen.onclick(planet_info)
+canvas.bind("<Motion>", hover_info)
+
+# ----------------- Encounters (sweep and prune) -----------------
+# Engine bodies, the Sun and the comet are watched; belt dots are only
+# tested against those. Distances are in unzoomed px, so zooming out does
+# not make neighbouring bodies "collide".
+APPROACH_PX = 10  # surfaces closer than this are a close approach
+
+def encounter_name(k):
+    n = len(pick_radius)
+    if k < n:
+        p = planets.find("orbit", k)
+        return "Moon" if p is None else p.name
+    if k < n + 2:
+        return ("Sun", "Comet")[k - n]
+    if gravity is not None:
+        return f"Belt particle {k - n - 2}"
+    return f"Asteroid {k - n - 2}"
+
+latest_encounter = None  # (kind, i, j) of the newest event, shown once per frame
+
+def report_encounter(kind, i, j):
+    global latest_encounter
+    latest_encounter = (kind, i, j)
+
+encounters = SweepAndPrune(
+    APPROACH_PX,
+    on_approach=lambda i, j, dist: report_encounter("Close approach", i, j),
+    on_collision=lambda i, j, dist: report_encounter("Collision", i, j))
+highlights = Highlights(screen)
+encounter_xy = None  # (xs, ys, radii) in screen px of the last check
+
+def check_encounters(xs, ys, zoom):
+    global encounter_xy, latest_encounter
+    n = len(xs)
+    px, py = [xs, [0.0, comet["x"]]], [ys, [0.0, comet["y"]]]
+    pr = [pick_radius, [SUN_RADIUS, COMET_RADIUS]]
+    if belt_xy is not None:
+        px.append(belt_xy[0])
+        py.append(belt_xy[1])
+        pr.append(np.full(len(belt_xy[0]), BELT_RADIUS))
+    ex, ey, er = np.concatenate(px), np.concatenate(py), np.concatenate(pr)
+    scale = np.full(len(ex), zoom)
+    scale[n:n + 2] = 1.0  # Sun and comet are not zoomed
+    watch = np.arange(len(ex)) < n + 2
+    group = np.arange(len(ex))
+    group[moon["index"]] = earth_index  # a moon never "meets" its planet
+    encounters.update(ex / scale, ey / scale, er, watch, group)
+    encounter_xy = (ex, ey, er)
+    if latest_encounter is not None:
+        kind, i, j = latest_encounter
+        encounter_label.config(text=f"{kind}: {encounter_name(i)} - {encounter_name(j)}")
+        latest_encounter = None
+
+# ----------------- Draw Frame -----------------
+def set_renderer(backend):
+    """Swap the body renderer, keeping every body's colour and size."""
+    global renderer
+    if backend != renderer.name:
+        new = RENDERERS[backend](screen)
+        new.copy_bodies(renderer)
+        renderer.destroy()
+        renderer = new
+
+def place_labels(xs, ys, on_screen):
+    """Planet names: LOD by on-screen orbit size, overlapping labels dropped."""
+    shown = [p for p in planets if on_screen[p.orbit]
+             and math.hypot(xs[p.orbit], ys[p.orbit]) >= LABEL_MIN_PX]
+    shown.sort(key=lambda p: -p.diameter)  # big planets keep their labels
+    x0 = np.array([xs[p.orbit] + 8 for p in shown])
+    y0 = np.array([ys[p.orbit] + 8 for p in shown])
+    width = np.array([LABEL_CHAR_PX * len(p.name) for p in shown])
+    keep = suppress_overlaps(x0, y0, x0 + width, y0 + LABEL_HEIGHT_PX)
+    placed = set()
+    for p, x, y, k in zip(shown, x0, y0, keep):
+        if k:
+            p.label.place(x, y, p.name)
+            placed.add(p.orbit)
+    for p in planets:
+        if p.orbit not in placed:
+            p.label.show(False)
+
+def draw_frame(xs, ys, show_trails):
+    """Move every canvas item to the positions of this frame."""
+    global star_dx
+    on_screen = visible_mask(xs, ys, pick_radius, *view_half_size())
+    # Drift stars (one batched move, only wrapped stars repositioned)
+    stars.drift(star_dx)
+    star_dx = 0.0
+    frame_timer.lap("stars")
+
+    # --- Sun and comet tails (one image item per pool) ---
+    sun_tail_image.draw(*view_half_size())
+    comet_tail_image.draw(*view_half_size())
+    frame_timer.lap("tails")
+
+    # Trails
+    for p in planets:
+        if show_trails:
+            p.trail.push(xs[p.orbit], ys[p.orbit])  # moves one recycled dot
+        else:
+            p.trail.clear()
+    frame_timer.lap("trails")
+
+    # Moon orbiting Earth (LOD: hidden when its orbit shrinks to nothing
+    # at this zoom; it is drawn at its own unzoomed distance otherwise)
+    m = moon["index"]
+    shown = on_screen.copy()
+    shown[m] &= engine.a[m] * zoom_var.get() >= MOON_MIN_PX
+    # Every body in one batched call; off-screen bodies are hidden, not moved
+    renderer.draw(xs, ys, shown)
+    frame_timer.lap("bodies")
+
+    # Label planet names (only the position changes)
+    place_labels(xs, ys, on_screen)
+    frame_timer.lap("labels")
+
+    # Comet and encounter rings
+    comet["turtle"].goto(comet["x"], comet["y"])
+    if highlight_var.get() and encounter_xy is not None:
+        highlights.draw(*encounter_xy, encounters)
+    else:
+        highlights.clear()
+    frame_timer.lap("encounters")
+
+    # Rings and glows (one move per decorated body)
+    decorations.draw(xs, ys, on_screen)
+    frame_timer.lap("decorations")
 
 # ----------------- Update Simulation -----------------
 def update_simulation():
-    global sun_x, last_time
-
-    if not paused.get():
+    global sun_x, kepler_day, pick_source, star_dx, gravity_backlog
+
+    frame_timer.begin()
+    if player is not None:
+        frame = player.poll(replay_event)  # recorded positions, no physics
+        frame_timer.lap("physics")
+        if frame is not None:
+            pick_source = (frame.x, frame.y, None)
+            check_encounters(frame.x, frame.y, zoom_var.get())
+            if scheduler.render:
+                draw_frame(frame.x, frame.y, show_trails_var.get())
+    elif paused.get():
+        clock.reset()  # paused time never reaches the physics
+        if sim_worker is not None:
+            sim_worker.set_controls(paused=True)
+    else:
         zoom = zoom_var.get()
         speed_mult = speed_var.get()
         show_trails = show_trails_var.get()
 
-        current_time = time.time()
-        dt = current_time - last_time
-        last_time = current_time
+        # Fixed-size physics steps; dt is the simulated time this frame
+        steps = clock.advance()
+        dt = steps * PHYSICS_DT
 
         # Move Sun forward
         sun_x += sun_speed * dt * speed_mult
-
-        # Drift stars
-        star_t.clear()
-        for s in stars:
-            s[0] -= 20 * dt * speed_mult
-            if s[0] < -520:   # wrap around
-                s[0] = 520
-                s[1] = random.randint(-350, 350)
-            star_t.goto(s[0], s[1])
-            star_t.dot(2, "white")
-
-        # --- Sun Tail Effect ---
-        sun_trail.append((0, 0))  # Sun is at center
-        if len(sun_trail) > 40:
-            sun_trail.pop(0)
-
-        sun_tail.clear()
-        for i, (sx, sy) in enumerate(sun_trail):
-            alpha = i / len(sun_trail)
-            sun_tail.goto(sx - i * 6, sy)  # push back in X direction
-            sun_tail.dot(int(12 * (1 - alpha) + 3), "orange")
-
-        # Update planets
-        for p in planets:
-            p["angle"] += p["speed"] * dt * speed_mult
-            angle_rad = math.radians(p["angle"])
-
-            real_x = sun_x + math.cos(angle_rad) * p["radius"] * zoom
-            real_y = math.sin(angle_rad) * p["radius"] * zoom
-
-            screen_x = real_x - sun_x
-            screen_y = real_y
-
-            p["turtle"].goto(screen_x, screen_y)
-
-            # Trails
-            if show_trails:
-                p["trail"].append((screen_x, screen_y))
-                if len(p["trail"]) > 50:
-                    p["trail"].pop(0)
-
-                p["trail_t"].clear()
-                for tx, ty in p["trail"]:
-                    p["trail_t"].goto(tx, ty)
-                    p["trail_t"].dot(2, p["turtle"].color()[0])
+        move_comet(dt * speed_mult)
+        update_tails(dt * speed_mult)
+
+        # Update planets (one batched step for every body)
+        for _ in range(steps):
+            engine.step(PHYSICS_DT * speed_mult)
+        if gravity is None or sim_worker is None:
+            timeline.record()
+        xs, ys = engine.evaluate(zoom, alpha=clock.alpha)
+        if sim_worker is not None:
+            # the worker steps on its own; we only read its last finished frame
+            sim_worker.set_controls(speed_mult)
+        if gravity is not None:
+            if sim_worker is not None:
+                gravity.pos = sim_worker.latest(gravity.pos)
+            elif gravity_backlog:
+                gravity_backlog += steps  # still catching up after a seek
+                fast_forward_gravity(PHYSICS_DT * speed_mult)
+            else:
+                for _ in range(steps):
+                    gravity.step(PHYSICS_DT * speed_mult)
+            xs, ys = gravity_positions(xs, ys, zoom)
+        elif kepler_var.get():
+            if sim_worker is not None:
+                kepler_day = worker_day + sim_worker.sim_time * DAYS_PER_SECOND
             else:
-                p["trail"].clear()
-                p["trail_t"].clear()
-
-            # Label planet name
-            p["label"].clear()
-            p["label"].goto(screen_x + 8, screen_y + 8)
-            p["label"].write(p["name"], font=("Arial", 7, "normal"))
-
-            # Moon orbiting Earth
-            if p["name"] == "Earth":
-                moon["angle"] += moon["speed"] * dt * speed_mult
-                mx = screen_x + math.cos(moon["angle"]) * moon["radius"]
-                my = screen_y + math.sin(moon["angle"]) * moon["radius"]
-                moon["turtle"].goto(mx, my)
-
-            # Saturn rings
-            if p["name"] == "Saturn":
-                ring_t.clear()
-                ring_t.penup()
-                ring_t.goto(screen_x, screen_y - 12)
-                ring_t.pendown()
-                ring_t.circle(20)
-                ring_t.penup()
-                ring_t.goto(screen_x, screen_y - 18)
-                ring_t.pendown()
-                ring_t.circle(25)
-
-       
-
-    screen.update()
-    root.after(30, update_simulation)
+                kepler_day += dt * speed_mult * DAYS_PER_SECOND
+            xs, ys = kepler_positions(xs, ys, zoom)
+        pick_source = (xs, ys, belt_xy)
+        check_encounters(xs, ys, zoom)
+        if recorder is not None:
+            recorder.frame(xs, ys)
+        frame_timer.lap("physics")
+
+        star_dx += 20 * dt * speed_mult
+        if scheduler.render:  # the rest is skipped while catching up
+            draw_frame(xs, ys, show_trails)
+
+    hud.update()
+    frame_timer.lap("hud")
+    if scheduler.render:
+        screen.update()
+    frame_timer.lap("update")
+    frame_timer.end()
+    root.after(scheduler.frame_done(), update_simulation)  # next deadline
 
 # ----------------- Start Simulation -----------------
 update_simulation()
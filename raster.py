@@ -0,0 +1,133 @@
+"""
+Raster
+------
+Small NumPy raster helpers: RGB frames, dots, and PNG/PPM writers.
+
+Images are uint8 arrays shaped (height, width, 3). Writers only use
+the standard library (zlib/struct) so they work without a display.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+
+# Tk colour names used by the scenes (anything else must be "#rrggbb")
+COLOR_NAMES = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "gray": (190, 190, 190),
+    "orange": (255, 165, 0), "blue": (0, 0, 255), "red": (255, 0, 0),
+    "brown": (165, 42, 42), "gold": (255, 215, 0), "yellow": (255, 255, 0),
+    "lightblue": (173, 216, 230), "light blue": (173, 216, 230),
+    "purple": (160, 32, 240),
+}
+
+
+def parse_color(color):
+    """RGB tuple for a colour name, "#rrggbb" string or RGB tuple."""
+    if isinstance(color, tuple):
+        return color
+    if color.startswith("#"):
+        return tuple(int(color[k:k + 2], 16) for k in (1, 3, 5))
+    return COLOR_NAMES[color.lower()]
+
+
+def new_image(width, height, color=(0, 0, 0)):
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    img[:] = color
+    return img
+
+
+def dot_offsets(size):
+    """Pixel offsets covering a dot of the given diameter (like turtle.dot)."""
+    size = max(int(size), 1)
+    r = size / 2.0
+    c = (size - 1) / 2.0
+    dy, dx = np.mgrid[0:size, 0:size]
+    inside = (dx - c) ** 2 + (dy - c) ** 2 <= r * r
+    return dx[inside] - int(c), dy[inside] - int(c)
+
+
+def draw_dots(img, px, py, size, color=(255, 255, 255)):
+    """Stamp same-sized dots at integer pixel centres (px, py), clipped."""
+    h, w = img.shape[:2]
+    px = np.asarray(px, dtype=int)
+    py = np.asarray(py, dtype=int)
+    for ox, oy in zip(*dot_offsets(size)):
+        x, y = px + ox, py + oy
+        keep = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+        img[y[keep], x[keep]] = color
+
+
+def draw_disc(img, cx, cy, r, color):
+    """Filled circle of radius r (pixels) centred on (cx, cy)."""
+    h, w = img.shape[:2]
+    x0, x1 = max(int(cx - r), 0), min(int(cx + r) + 2, w)
+    y0, y1 = max(int(cy - r), 0), min(int(cy + r) + 2, h)
+    if x0 >= x1 or y0 >= y1:
+        return
+    yy, xx = np.mgrid[y0:y1, x0:x1]
+    inside = (xx - cx) ** 2 + (yy - cy) ** 2 <= r * r
+    img[y0:y1, x0:x1][inside] = color
+
+
+def draw_polyline(img, xs, ys, color, width=1):
+    """Connected line through the points, sampled about once per pixel."""
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    seg = np.hypot(np.diff(xs), np.diff(ys))
+    n = np.maximum(np.ceil(seg).astype(int), 1)
+    start = np.repeat(np.arange(len(n)), n)
+    t = (np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)) / n[start]
+    px = xs[start] + (xs[start + 1] - xs[start]) * t
+    py = ys[start] + (ys[start + 1] - ys[start]) * t
+    draw_dots(img, np.rint(px), np.rint(py), width, color)
+
+
+def write_ppm(path, img):
+    h, w = img.shape[:2]
+    with open(path, "wb") as f:
+        f.write(b"P6\n%d %d\n255\n" % (w, h))
+        f.write(np.ascontiguousarray(img, dtype=np.uint8).tobytes())
+
+
+def png_bytes(img, level=6, palette=None):
+    """PNG file contents for an RGB (h, w, 3) or RGBA (h, w, 4) image.
+
+    With `palette` (k, 4) RGBA, `img` is (h, w) palette indices: one byte
+    per pixel, with per-entry transparency (PLTE + tRNS chunks).
+    """
+    if palette is not None:
+        img = img[..., None]
+    h, w, channels = img.shape
+    # every scanline starts with filter type 0 (None)
+    rows = np.zeros((h, w * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = np.ascontiguousarray(img, dtype=np.uint8).reshape(h, w * channels)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    if palette is not None:
+        palette = np.asarray(palette, dtype=np.uint8)
+        color_type = 3
+        extra = [chunk(b"PLTE", palette[:, :3].tobytes()), chunk(b"tRNS", palette[:, 3].tobytes())]
+    else:
+        color_type = 6 if channels == 4 else 2
+        extra = []
+    return b"".join([b"\x89PNG\r\n\x1a\n",
+                     chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, color_type, 0, 0, 0)),
+                     *extra,
+                     chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+                     chunk(b"IEND", b"")])
+
+
+def write_png(path, img):
+    with open(path, "wb") as f:
+        f.write(png_bytes(img))
+
+
+def write_image(path, img):
+    """Write PNG or PPM depending on the file extension."""
+    if str(path).lower().endswith(".ppm"):
+        write_ppm(path, img)
+    else:
+        write_png(path, img)
@@ -0,0 +1,213 @@
+"""
+Recording
+---------
+Record the body positions drawn each frame, plus control changes (pause,
+speed, zoom, ...), and play them back later without running any physics.
+
+    python projects.py --record run.rec
+    python projects.py --replay run.rec --replay-speed 2 --replay-from 30
+
+Recording happens on the animation thread only as far as copying the
+positions into a list; every `chunk_frames` frames the list is handed to
+a background thread that packs, compresses (zlib) and writes it, so a
+frame never waits for the disk or for compression.
+
+File layout:
+
+    b"SSREC\\x00\\x01\\x00"   magic + version
+    chunk*                 header, events, payload
+
+    header   <IIIdd: events length, payload length, frames, t_first, t_last
+    events   JSON [[frame, name, value], ...] (uncompressed, usually tiny)
+    payload  zlib(snapshot.pack({"t": float64[k], "n": int32[k],
+                                 "xy": float32[sum(n), 2]}))
+
+`t` is seconds since recording started (wall time, so stalls and pauses
+replay as they happened). An event is applied before frame number
+`frame` of its chunk. `frames()` reads lazily and skips whole chunks
+before an offset using only their headers; the events of skipped chunks
+are still delivered, so controls are in the right state at the offset.
+"""
+import argparse
+import atexit
+import json
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+from snapshot import pack, unpack
+
+MAGIC = b"SSREC\x00\x01\x00"
+CHUNK = struct.Struct("<IIIdd")
+
+Frame = namedtuple("Frame", "t x y events")
+
+
+class Recorder:
+    def __init__(self, path, chunk_frames=120, level=1, now=time.perf_counter):
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.level = level
+        self.now = now
+        self.t0 = now()
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self._reset_chunk()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="recorder",
+                                        daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _reset_chunk(self):
+        self._t, self._n, self._xy, self._events = [], [], [], []
+
+    def frame(self, xs, ys):
+        """Record the positions drawn this frame (copied; cheap)."""
+        xy = np.empty((len(xs), 2), dtype=np.float32)
+        xy[:, 0] = xs
+        xy[:, 1] = ys
+        self._t.append(self.now() - self.t0)
+        self._n.append(len(xs))
+        self._xy.append(xy)
+        if len(self._t) >= self.chunk_frames:
+            self.flush()
+
+    def event(self, name, value):
+        """Record a control change; applied before the next recorded frame."""
+        self._events.append([len(self._t), name, value])
+
+    def flush(self):
+        """Hand the current chunk to the writer thread."""
+        if self._t or self._events:
+            stamp = self.now() - self.t0
+            self._queue.put((self._t, self._n, self._xy, self._events, stamp))
+            self._reset_chunk()
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self.file.close()
+        self.file = None
+        atexit.unregister(self.close)
+        print(f"Recording saved to {self.path}")
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            t, n, xy, events, stamp = item
+            payload = zlib.compress(pack({
+                "t": np.array(t, dtype=np.float64),
+                "n": np.array(n, dtype=np.int32),
+                "xy": np.concatenate(xy) if xy else np.zeros((0, 2), np.float32),
+            }), self.level)
+            head = json.dumps(events).encode()
+            t_first, t_last = (t[0], t[-1]) if t else (stamp, stamp)
+            self.file.write(CHUNK.pack(len(head), len(payload), len(t), t_first, t_last))
+            self.file.write(head)
+            self.file.write(payload)
+        self.file.flush()
+
+
+def frames(path, start=0.0):
+    """Yield Frame(t, x, y, events) from `start` seconds on, one chunk at a time.
+
+    `events` are the (name, value) changes since the previous yielded
+    frame; the first frame also carries every change before `start`.
+    """
+    pending = []
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a recording")
+        while True:
+            head = f.read(CHUNK.size)
+            if len(head) < CHUNK.size:
+                return
+            events_len, payload_len, count, _, t_last = CHUNK.unpack(head)
+            events = json.loads(f.read(events_len))
+            if t_last < start:
+                pending.extend((name, value) for _, name, value in events)
+                f.seek(payload_len, 1)  # positions never decompressed
+                continue
+            chunk = unpack(zlib.decompress(f.read(payload_len)))
+            before = [[] for _ in range(count + 1)]
+            for k, name, value in events:
+                before[k].append((name, value))
+            offsets = np.concatenate([[0], np.cumsum(chunk["n"])])
+            xy = chunk["xy"].astype(np.float64)
+            for k in range(count):
+                pending.extend(before[k])
+                if chunk["t"][k] < start:
+                    continue
+                rows = xy[offsets[k]:offsets[k + 1]]
+                yield Frame(float(chunk["t"][k]), rows[:, 0], rows[:, 1], pending)
+                pending = []
+            pending.extend(before[count])
+
+
+class Player:
+    """Plays a recording against the wall clock at `speed`."""
+
+    def __init__(self, path, speed=1.0, start=0.0, now=time.perf_counter):
+        self.path = path
+        self.speed = speed
+        self.now = now
+        self.paused = False
+        self.seek(start)
+
+    def seek(self, t):
+        """Continue from `t` seconds into the recording (re-reads lazily)."""
+        self.t = max(t, 0.0)
+        self._frames = frames(self.path, self.t)
+        self._next = next(self._frames, None)
+        self._last = self.now()
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def set_speed(self, speed):
+        self.speed = min(max(speed, 1 / 16), 64.0)
+
+    @property
+    def done(self):
+        return self._next is None
+
+    def poll(self, on_event=None):
+        """Latest frame due by now (None if no new one); events go to on_event(name, value)."""
+        now = self.now()
+        if not self.paused:
+            self.t += (now - self._last) * self.speed
+        self._last = now
+        frame = None
+        while self._next is not None and self._next.t <= self.t:
+            frame = self._next
+            if on_event is not None:
+                for name, value in frame.events:
+                    on_event(name, value)
+            self._next = next(self._frames, None)
+        return frame
+
+
+def from_argv(argv=None):
+    """(recorder, player) from --record / --replay options; unused ones are None."""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--record", metavar="PATH")
+    parser.add_argument("--replay", metavar="PATH")
+    parser.add_argument("--replay-speed", type=float, default=1.0)
+    parser.add_argument("--replay-from", type=float, default=0.0, metavar="SECONDS")
+    args, _ = parser.parse_known_args(argv)
+    if args.replay:
+        return None, Player(args.replay, args.replay_speed, args.replay_from)
+    if args.record:
+        return Recorder(args.record), None
+    return None, None
@@ -0,0 +1,116 @@
+"""
+Renderers
+---------
+Interchangeable ways to draw the moving bodies of a scene.
+
+Both backends take the same calls: `add(color, radius)` once per body
+(ids are handed out 0, 1, 2, ... so they can match engine indices), then
+`draw(xs, ys, visible)` once per frame with whole position arrays.
+
+- `TurtleRenderer`: one RawTurtle per body (the original look; every
+  `goto` does turtle's own bookkeeping)
+- `CanvasRenderer`: one Tk oval per body, owned directly. Box corners are
+  computed for all bodies in one NumPy pass and only bodies that moved or
+  changed visibility touch the canvas, so thousands of bodies stay cheap.
+
+Switching backends: `new.copy_bodies(old)` then `old.destroy()`.
+"""
+import turtle
+
+import numpy as np
+
+
+class TurtleRenderer:
+    name = "turtle"
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.styles = []   # (color, radius) per body
+        self.turtles = []
+
+    def __len__(self):
+        return len(self.styles)
+
+    def add(self, color, radius):
+        t = turtle.RawTurtle(self.screen)
+        t.shape("circle")
+        t.color(color)
+        t.shapesize(radius / 10.0)  # the circle shape has a 10 px radius
+        t.penup()
+        self.turtles.append(t)
+        self.styles.append((color, radius))
+        return len(self.styles) - 1
+
+    def copy_bodies(self, other):
+        for color, radius in other.styles:
+            self.add(color, radius)
+
+    def draw(self, xs, ys, visible):
+        for t, x, y, v in zip(self.turtles, xs, ys, visible):
+            if v:
+                t.goto(x, y)
+            if t.isvisible() != v:
+                t.showturtle() if v else t.hideturtle()
+
+    def destroy(self):
+        for t in self.turtles:
+            t.hideturtle()
+        self.turtles = []
+        self.styles = []
+
+
+class CanvasRenderer:
+    name = "canvas"
+
+    def __init__(self, screen, tag="bodies"):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.tag = tag
+        self.styles = []
+        self.items = []
+        self.radius = np.zeros(0)
+        self._x = np.zeros(0)     # last drawn canvas position per body
+        self._y = np.zeros(0)
+        self._shown = np.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.styles)
+
+    def add(self, color, radius):
+        self.items.append(self.cv.create_oval(0, 0, 0, 0, fill=color, outline=color,
+                                              state="hidden", tags=(self.tag,)))
+        self.styles.append((color, radius))
+        self.radius = np.append(self.radius, radius)
+        self._x = np.append(self._x, np.nan)
+        self._y = np.append(self._y, np.nan)
+        self._shown = np.append(self._shown, False)
+        return len(self.styles) - 1
+
+    def copy_bodies(self, other):
+        for color, radius in other.styles:
+            self.add(color, radius)
+
+    def draw(self, xs, ys, visible):
+        n = len(self.items)
+        cx = np.asarray(xs[:n], dtype=float) * self.screen.xscale
+        cy = -np.asarray(ys[:n], dtype=float) * self.screen.yscale
+        visible = np.asarray(visible[:n], dtype=bool)
+        moved = visible & ((cx != self._x) | (cy != self._y))
+        rows = np.flatnonzero(moved)
+        if len(rows):
+            r = self.radius[rows]
+            boxes = np.column_stack([cx[rows] - r, cy[rows] - r, cx[rows] + r, cy[rows] + r])
+            coords, items = self.cv.coords, self.items
+            for k, box in zip(rows.tolist(), boxes.tolist()):
+                coords(items[k], *box)
+            self._x[rows], self._y[rows] = cx[rows], cy[rows]
+        for k in np.flatnonzero(visible != self._shown).tolist():
+            self.cv.itemconfigure(self.items[k], state="normal" if visible[k] else "hidden")
+        self._shown = visible.copy()
+
+    def destroy(self):
+        self.cv.delete(self.tag)
+        self.__init__(self.screen, self.tag)
+
+
+RENDERERS = {cls.name: cls for cls in (TurtleRenderer, CanvasRenderer)}
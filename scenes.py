@@ -0,0 +1,49 @@
+"""
+Scenes
+------
+Body tables and scene settings shared by the turtle scripts and the
+headless exporter (export_frames.py). The tables themselves are stored in
+data/planets.json (see catalog.py).
+
+- FINAL_*: Final_project.py (eight planets with info panels)
+- HELIX_*: projects.py (eight planets on circular orbits)
+- MINI_*:  solar_system_turtle.py (four planets and the Moon)
+"""
+from catalog import load_table
+
+# ---------- Final_project.py ----------
+# name, color, a, b, size, speed (°/step), diameter_km, density_g_cm3,
+# mass_kg, distance_million_km
+FINAL_PLANETS = load_table("final_planets")
+
+FINAL_SCENE = {
+    "width": 1600, "height": 1000,
+    "stars": {"count": 3000, "width": 1600, "height": 1000, "seed": 0, "sizes": (1, 2, 3)},
+    "orbit_color": "white",
+    "step": 0.03,  # seconds per physics step
+    # (radius, color, filled, pen width), drawn in order
+    "sun": [(r, "gold", True, 1) for r in range(35, 20, -3)] + [(18, "yellow", True, 1)],
+}
+
+# ---------- projects.py ----------
+# name, color, radius, speed (°/s), diameter_km, distance_km, velocity_km_s
+HELIX_PLANETS = load_table("helix_planets")
+
+# body name, kind ("ring" / "glow"), color, radius (px), width (px)
+HELIX_DECORATIONS = load_table("helix_decorations")
+
+# ---------- solar_system_turtle.py ----------
+# name, color, size_px, a, b, speed (°/step), tilt
+MINI_PLANETS = load_table("mini_planets")
+
+# name, color, size_px, parent, orbit_r, speed (°/step)
+MINI_MOONS = load_table("mini_moons")
+
+MINI_SCENE = {
+    "width": 1000, "height": 700,
+    "stars": {"count": 160, "width": 980, "height": 680, "seed": 42, "sizes": (1, 1, 2, 2, 3)},
+    "orbit_color": "#333333",
+    "step": 0.02,
+    "sun": [(20, "#FDB813", True, 1),
+            (40, "#FFB812", False, 2), (70, "#FFB812", False, 2), (100, "#FFB812", False, 2)],
+}
@@ -0,0 +1,191 @@
+"""
+Snapshots
+---------
+Compact binary snapshots of simulation state, plus in-memory checkpoints
+for seeking to another time without replaying from zero.
+
+A state is a flat dict of NumPy arrays and plain scalars (numbers,
+strings, booleans). `pack()` turns it into bytes:
+
+    b"SSNAP\\x00\\x01\\x00"  magic + version
+    uint32               header length
+    header               JSON: scalars + [[name, dtype, shape, offset]]
+    array data           raw little-endian bytes, back to back
+
+so the planets' orbit state is a few hundred bytes and loading is one
+`np.frombuffer` per array.
+
+`History` keeps a packed checkpoint every `every` physics steps; `seek()`
+restores the nearest checkpoint at or before the target and fast-forwards
+with the caller's headless `advance(n)`, so a jump costs at most `every`
+steps. Seeking forward just advances from the current state.
+
+`Timeline` bundles this for a script: it tracks the step count of a
+FixedStepClock and provides save/load/seek for the key bindings.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"SSNAP\x00\x01\x00"
+
+
+def pack(state):
+    scalars, layout, blobs, offset = {}, [], [], 0
+    for name, value in state.items():
+        if isinstance(value, np.ndarray):
+            data = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+            layout.append([name, data.dtype.str, list(data.shape), offset])
+            blobs.append(data.tobytes())
+            offset += data.nbytes
+        else:
+            scalars[name] = value
+    header = json.dumps({"scalars": scalars, "arrays": layout}).encode()
+    return b"".join([MAGIC, struct.pack("<I", len(header)), header] + blobs)
+
+
+def unpack(data):
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a simulation snapshot")
+    (size,) = struct.unpack_from("<I", data, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(data[start:start + size])
+    base = start + size
+    state = dict(header["scalars"])
+    for name, dtype, shape, offset in header["arrays"]:
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        state[name] = np.frombuffer(data, dtype, count, base + offset).reshape(shape).copy()
+    return state
+
+
+def nest(prefix, state):
+    """Prefix the keys of a sub-state ("engine" -> "engine.angle", ...)."""
+    return {f"{prefix}.{key}": value for key, value in state.items()}
+
+
+def section(state, prefix):
+    """Inverse of nest(): the entries under `prefix`, without it."""
+    start = prefix + "."
+    return {key[len(start):]: value for key, value in state.items()
+            if key.startswith(start)}
+
+
+def save(path, state):
+    with open(path, "wb") as f:
+        f.write(pack(state))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return unpack(f.read())
+
+
+class History:
+    """Packed checkpoints keyed by physics step."""
+
+    def __init__(self, every=600, keep=500):
+        self.every = every
+        self.keep = keep
+        self.steps = []      # ascending
+        self.blobs = []
+
+    def record(self, step, capture):
+        """Checkpoint `capture()` if `every` steps passed since the last one."""
+        if self.steps and step - self.steps[-1] < self.every:
+            return
+        self.steps.append(step)
+        self.blobs.append(pack(capture()))
+        if len(self.steps) > self.keep:
+            # thin out: drop every other old checkpoint, keep the newest half
+            half = len(self.steps) // 2
+            self.steps = self.steps[:half:2] + self.steps[half:]
+            self.blobs = self.blobs[:half:2] + self.blobs[half:]
+
+    def before(self, step):
+        """(step, state) of the latest checkpoint at or before `step`, or None."""
+        k = int(np.searchsorted(self.steps, step, side="right")) - 1
+        if k < 0:
+            return None
+        return self.steps[k], unpack(self.blobs[k])
+
+    def forget_after(self, step):
+        k = int(np.searchsorted(self.steps, step, side="right"))
+        del self.steps[k:], self.blobs[k:]
+
+    def clear(self):
+        self.steps, self.blobs = [], []
+
+
+def seek(history, now, target, restore, advance):
+    """Move the simulation from step `now` to `target`; return the step reached.
+
+    restore(state) loads a checkpoint, advance(n) runs n physics steps
+    without drawing. Going back past the first checkpoint stops at it.
+    """
+    target = max(int(target), 0)
+    if target < now:
+        if not history.steps:
+            return now
+        point = history.before(max(target, history.steps[0]))
+        now, state = point
+        restore(state)
+        history.forget_after(now)  # later checkpoints belong to the old timeline
+    if target > now:
+        advance(target - now)
+    return max(target, now)
+
+
+class Timeline:
+    """Save/load/seek for one script, in physics steps of `clock`.
+
+    capture() -> state dict, restore(state) and advance(n) (n headless
+    physics steps) are the script's own; the step count is added here.
+    """
+
+    def __init__(self, clock, capture, restore, advance, path, every=600):
+        self.clock = clock
+        self.capture = capture
+        self.restore = restore
+        self.advance = advance
+        self.path = path
+        self.history = History(every)
+
+    def _capture(self):
+        state = self.capture()
+        state["steps"] = self.clock.steps_taken
+        return state
+
+    def _restore(self, state):
+        self.restore(state)
+        self.clock.steps_taken = int(state["steps"])
+        self.clock.reset()
+
+    def _advance(self, n):
+        self.advance(n)
+        self.clock.steps_taken += n
+
+    def record(self):
+        """Call once per frame; checkpoints every `every` steps."""
+        self.history.record(self.clock.steps_taken, self._capture)
+
+    def save(self):
+        save(self.path, self._capture())
+        print(f"Snapshot saved to {self.path}")
+
+    def load(self):
+        if not os.path.exists(self.path):
+            print(f"No snapshot at {self.path}")
+            return
+        self._restore(load(self.path))
+        self.history.clear()  # the old checkpoints are from another timeline
+        self.record()
+        print(f"Snapshot loaded from {self.path}")
+
+    def seek_seconds(self, seconds):
+        """Jump by `seconds` of simulated time (negative = back)."""
+        target = self.clock.steps_taken + int(round(seconds / self.clock.step))
+        seek(self.history, self.clock.steps_taken, target, self._restore, self._advance)
+        self.clock.reset()
@@ -4,7 +4,7 @@ Solar System with Python Turtle
 --------------------------------
 - Sun at center
 - 4 planets with different sizes, colors, and orbits (one elliptical)
-- Motion with an animation loop (ontimer)
+- Motion with an animation loop (ontimer on fixed frame deadlines)
 - Labels for each planet
 - Optional enhancements:
     * Stars background
@@ -16,14 +16,31 @@ Controls:
   [-]     Slow down
   [T]     Toggle planet trails
   [O]     Toggle orbit guides on/off
+  [H]     Toggle frame-timing overlay
+  [P]     Save frame-timing stats (JSON + CSV)
+  [F5/F9] Save / load a snapshot
+  [ / ]   Jump back / forward one minute
   [Q]     Quit
+Record / replay:
+  python solar_system_turtle.py --record run.rec
+  python solar_system_turtle.py --replay run.rec [--replay-speed 2] [--replay-from 30]
+  (while replaying, Space pauses, +/- change the playback speed and [ / ] skip 10 s)
 """
-import math
-import random
 import turtle as T
+import numpy as np
+from orbit_engine import OrbitEngine
+from bodies import BodyStore
+from labels import Label
+from starfield import draw_star_field
+from orbits import OrbitGuide
+from clock import FixedStepClock, FrameScheduler
+from scenes import MINI_MOONS, MINI_PLANETS, MINI_SCENE
+from profiling import PhaseTimer, StatsHUD
+from snapshot import Timeline, nest, section
+from recording import from_argv
 
 # ---------- Screen setup ----------
-WIDTH, HEIGHT = 1000, 700
+WIDTH, HEIGHT = MINI_SCENE["width"], MINI_SCENE["height"]
 screen = T.Screen()
 screen.setup(WIDTH, HEIGHT)
 screen.bgcolor("black")
@@ -32,26 +49,10 @@ screen.tracer(False)  # We will manually update frames
 
 # ---------- Utility ----------
 def draw_stars(n=120):
-    rng = random.Random(42)  # deterministic
-    star = T.Turtle(visible=False)
-    star.hideturtle()
-    star.speed(0)
-    star.color("white")
-    star.penup()
-    for _ in range(n):
-        x = rng.randint(-WIDTH//2 + 10, WIDTH//2 - 10)
-        y = rng.randint(-HEIGHT//2 + 10, HEIGHT//2 - 10)
-        star.goto(x, y)
-        size = rng.choice([1,1,2,2,3])
-        star.dot(size)
-
-def deg2rad(d): 
-    return d * math.pi / 180.0
-
-def rotated(x, y, tilt_deg):
-    t = deg2rad(tilt_deg)
-    ct, st = math.cos(t), math.sin(t)
-    return x*ct - y*st, x*st + y*ct
+    # deterministic (seed 42), baked once and cached as one image item
+    stars = MINI_SCENE["stars"]
+    draw_star_field(screen, n, width=stars["width"], height=stars["height"],
+                    seed=stars["seed"], sizes=stars["sizes"])
 
 # Draw the Sun with a simple "glow"
 def draw_sun():
@@ -76,41 +77,20 @@ def draw_sun():
         sun.penup()
     return sun
 
-# ---------- Orbits ----------
-def draw_orbit_ellipse(a, b=None, tilt=0, color="#333333"):
-    """Return a Turtle that draws (and keeps) the orbit guide."""
-    if b is None: b = a
-    orb = T.Turtle(visible=False)
-    orb.hideturtle()
-    orb.speed(0)
-    orb.pensize(1)
-    orb.color(color)
-    orb.penup()
-    steps = 360
-    # move to start point
-    x0, y0 = rotated(a, 0, tilt)
-    orb.goto(x0, y0)
-    orb.pendown()
-    for d in range(1, steps+1):
-        t = deg2rad(d)
-        x, y = a*math.cos(t), b*math.sin(t)
-        x, y = rotated(x, y, tilt)
-        orb.goto(x, y)
-    orb.penup()
-    return orb
-
 # ---------- Planet classes ----------
-class Planet:
+engine = OrbitEngine()  # orbit state for every planet and moon
+# per-body data in columns; the classes below only add their display handles
+bodies = BodyStore(name=object, color=object, size_px=float, index=np.intp, trail=bool)
+
+class Planet(bodies.view_class):
+    __slots__ = ("t", "label", "orbit")
+
     def __init__(self, name, color, size_px, orbit_a, orbit_b=None, speed_deg=1.0, tilt=0, start_angle=0, show_orbit=True):
-        self.name = name
-        self.color = color
-        self.size_px = size_px
-        self.a = orbit_a
-        self.b = orbit_b if orbit_b is not None else orbit_a
-        self.tilt = tilt  # degrees
-        self.base_speed = speed_deg
-        self.theta = start_angle  # current angle in degrees
-        self.trail = False
+        # orbit state (a, b, tilt in degrees, speed, angle) lives in the engine
+        index = engine.add_body(orbit_a, orbit_b, speed=speed_deg,
+                                tilt=tilt, angle=start_angle)
+        super().__init__(bodies, bodies.add(name=name, color=color, size_px=size_px,
+                                            index=index).row)
         # body turtle
         self.t = T.Turtle()
         self.t.hideturtle()
@@ -120,27 +100,26 @@ class Planet:
         scale = max(self.size_px / 20.0, 0.2)  # 20px default circle
         self.t.shapesize(scale, scale)
         self.t.penup()
-        # label turtle
-        self.label = T.Turtle(visible=False)
-        self.label.hideturtle()
-        self.label.speed(0)
-        self.label.color("white")
-        self.label.penup()
-        # orbit guide
-        self.orbit_drawer = draw_orbit_ellipse(self.a, self.b, self.tilt) if show_orbit else None
-        self.visible = True
-        self._pos = (0.0, 0.0)
+        # label (one text item, only moved each frame)
+        self.label = Label(screen, align="left", font=("Arial", 10, "normal"))
+        # orbit guide (cached path, one canvas line; toggling just hides it)
+        self.orbit = OrbitGuide(screen, self.a, self.b, self.tilt, visible=show_orbit)
+
+    @property
+    def a(self): return engine.a[self.index]
+    @property
+    def b(self): return engine.b[self.index]
+    @property
+    def tilt(self): return engine.tilt[self.index]
+    @property
+    def theta(self): return engine.angle[self.index]
 
     def position(self):
-        """Return current x, y coordinates (and store)."""
-        th = deg2rad(self.theta)
-        x, y = self.a*math.cos(th), self.b*math.sin(th)
-        x, y = rotated(x, y, self.tilt)
-        self._pos = (x, y)
-        return x, y
-
-    def move(self, speed_scale=1.0):
-        self.theta = (self.theta + self.base_speed * speed_scale) % 360.0
+        """Return current x, y coordinates from the engine arrays."""
+        return self.x, self.y
+
+    def move(self):
+        """Draw at the position computed by the last engine step."""
         x, y = self.position()
         if self.trail:
             self.t.pendown()
@@ -149,35 +128,29 @@ class Planet:
         self.t.goto(x, y)
         if not self.t.isvisible():
             self.t.showturtle()
+
+    def draw_label(self):
         # label slightly offset
-        self.label.clear()
-        self.label.goto(x + 8, y + 10)
-        self.label.write(self.name, align="left", font=("Arial", 10, "normal"))
+        self.label.place(self.x + 8, self.y + 10, self.name)
 
     def toggle_orbit(self, show: bool):
-        if show and self.orbit_drawer is None:
-            self.orbit_drawer = draw_orbit_ellipse(self.a, self.b, self.tilt)
-        elif not show and self.orbit_drawer is not None:
-            self.orbit_drawer.clear()
-            self.orbit_drawer.hideturtle()
-            self.orbit_drawer = None
+        self.orbit.show(show)
 
     @property
-    def x(self): return self._pos[0]
+    def x(self): return engine.x[self.index]
     @property
-    def y(self): return self._pos[1]
+    def y(self): return engine.y[self.index]
+
 
+class Moon(bodies.view_class):
+    __slots__ = ("parent", "t", "label", "orbit")
 
-class Moon:
     def __init__(self, name, color, size_px, parent: Planet, orbit_r=25, speed_deg=6.0, start_angle=0):
-        self.name = name
-        self.color = color
-        self.size_px = size_px
+        index = engine.add_body(orbit_r, speed=speed_deg,
+                                angle=start_angle, parent=parent.index)
+        super().__init__(bodies, bodies.add(name=name, color=color, size_px=size_px,
+                                            index=index).row)
         self.parent = parent
-        self.r = orbit_r
-        self.base_speed = speed_deg
-        self.theta = start_angle
-        self.trail = False
         # body
         self.t = T.Turtle()
         self.t.hideturtle()
@@ -188,19 +161,17 @@ class Moon:
         self.t.shapesize(scale, scale)
         self.t.penup()
         # label
-        self.label = T.Turtle(visible=False)
-        self.label.hideturtle()
-        self.label.speed(0)
-        self.label.color("white")
-        self.label.penup()
-        # orbit guide (relative to parent, drawn dynamically is messy; omit fixed guide)
-        self.orbit_drawer = None
-
-    def move(self, speed_scale=1.0):
-        self.theta = (self.theta + self.base_speed * speed_scale) % 360.0
-        th = deg2rad(self.theta)
-        px, py = self.parent.x, self.parent.y
-        x, y = px + self.r*math.cos(th), py + self.r*math.sin(th)
+        self.label = Label(screen, align="left", font=("Arial", 9, "normal"))
+        # orbit guide around the parent; moved along with it each frame
+        self.orbit = OrbitGuide(screen, orbit_r)
+
+    def follow_parent(self):
+        """Keep the orbit guide centred on the (moving) parent."""
+        if self.orbit.visible:
+            self.orbit.move_to(self.parent.x, self.parent.y)
+
+    def move(self):
+        x, y = engine.x[self.index], engine.y[self.index]
         if self.trail:
             self.t.pendown()
         else:
@@ -208,46 +179,28 @@ class Moon:
         self.t.goto(x, y)
         if not self.t.isvisible():
             self.t.showturtle()
-        self.label.clear()
-        self.label.goto(x + 6, y + 8)
-        self.label.write(self.name, align="left", font=("Arial", 9, "normal"))
+
+    def draw_label(self):
+        self.label.place(engine.x[self.index] + 6, engine.y[self.index] + 8, self.name)
 
     def toggle_orbit(self, show: bool):
-        # For simplicity, re-draw relative orbit each time when show=True.
-        if not show:
-            if self.orbit_drawer:
-                self.orbit_drawer.clear()
-                self.orbit_drawer.hideturtle()
-                self.orbit_drawer = None
-        else:
-            if self.orbit_drawer is None:
-                self.orbit_drawer = T.Turtle(visible=False)
-                self.orbit_drawer.hideturtle()
-                self.orbit_drawer.speed(0)
-                self.orbit_drawer.color("#333333")
-            # Draw a small circle around current parent position
-            self.orbit_drawer.clear()
-            self.orbit_drawer.penup()
-            self.orbit_drawer.goto(self.parent.x, self.parent.y - self.r)
-            self.orbit_drawer.pendown()
-            self.orbit_drawer.circle(self.r)
-            self.orbit_drawer.penup()
+        self.orbit.show(show)
 
 
 # ---------- Build the scene ----------
-draw_stars(160)
+draw_stars(MINI_SCENE["stars"]["count"])
 sun = draw_sun()
 
 planets = []
-# name, color, size_px, a, b, speed, tilt
-planets.append(Planet("Mercury", "#A3A3A3", 8, orbit_a=70, orbit_b=60, speed_deg=3.6, tilt=10))
-planets.append(Planet("Venus",   "#E39F3A", 12, orbit_a=110, orbit_b=105, speed_deg=1.8, tilt=-5))
-earth = Planet("Earth",   "#1E90FF", 12, orbit_a=150, orbit_b=150, speed_deg=1.2, tilt=0)
-planets.append(earth)
-planets.append(Planet("Mars",    "#D14B3D", 10, orbit_a=190, orbit_b=180, speed_deg=0.96, tilt=15))
+# name, color, size_px, a, b, speed, tilt (table in scenes.py)
+for name, color, size_px, a, b, speed, tilt in MINI_PLANETS:
+    planets.append(Planet(name, color, size_px, orbit_a=a, orbit_b=b, speed_deg=speed, tilt=tilt))
+by_name = {p.name: p for p in planets}
+earth = by_name["Earth"]
 
 moons = []
-moons.append(Moon("Moon", "#C0C0C0", 6, parent=earth, orbit_r=24, speed_deg=5.0))
+for name, color, size_px, parent, orbit_r, speed in MINI_MOONS:
+    moons.append(Moon(name, color, size_px, parent=by_name[parent], orbit_r=orbit_r, speed_deg=speed))
 
 # ---------- Controls & Animation ----------
 state = {
@@ -259,22 +212,51 @@ state = {
 
 def toggle_pause():
     state["paused"] = not state["paused"]
+    record_controls()
 
 def speed_up():
     state["speed_scale"] *= 1.25
+    record_controls()
 
 def slow_down():
     state["speed_scale"] /= 1.25
+    record_controls()
+
+def set_trails(on):
+    state["trail"] = on
+    for p in planets: p.trail = on
+    for m in moons: m.trail = on
+
+def set_orbits(on):
+    state["show_orbits"] = on
+    for p in planets: p.toggle_orbit(on)
+    for m in moons: m.toggle_orbit(on)
 
 def toggle_trails():
-    state["trail"] = not state["trail"]
-    for p in planets: p.trail = state["trail"]
-    for m in moons: m.trail = state["trail"]
+    set_trails(not state["trail"])
+    record_controls()
 
 def toggle_orbits():
-    state["show_orbits"] = not state["show_orbits"]
-    for p in planets: p.toggle_orbit(state["show_orbits"])
-    for m in moons: m.toggle_orbit(state["show_orbits"])
+    set_orbits(not state["show_orbits"])
+    record_controls()
+
+# Record / replay (see recording.py); controls are recorded as absolute values
+recorder, player = from_argv()
+
+def record_controls():
+    if recorder is not None:
+        for name, value in state.items():
+            recorder.event(name, value)
+
+def replay_event(name, value):
+    if name == "trail":
+        set_trails(value)
+    elif name == "show_orbits":
+        set_orbits(value)
+    else:
+        state[name] = value
+
+record_controls()
 
 def quit_app():
     try:
@@ -288,7 +270,7 @@ help_t.hideturtle()
 help_t.color("white")
 help_t.penup()
 help_lines = [
-    "[Space] Pause/Resume  [+/-] Speed  [T] Trails  [O] Toggle orbits  [Q] Quit"
+    "[Space] Pause/Resume  [+/-] Speed  [T] Trails  [O] Toggle orbits  [H/P] Stats  [F5/F9] Snapshot  [ [ / ] ] Seek  [Q] Quit"
 ]
 help_t.goto(-WIDTH//2 + 14, HEIGHT//2 - 24)
 help_t.write(help_lines[0], align="left", font=("Arial", 12, "normal"))
@@ -301,18 +283,89 @@ screen.onkey(slow_down, "-")
 screen.onkey(toggle_trails, "t")
 screen.onkey(toggle_orbits, "o")
 screen.onkey(quit_app, "q")
+screen.onkey(lambda: hud.toggle(), "h")
+screen.onkey(lambda: hud.dump(), "p")
+screen.onkey(lambda: timeline.save(), "F5")
+screen.onkey(lambda: jump(timeline.load), "F9")
+screen.onkey(lambda: jump(lambda: timeline.seek_seconds(-60)), "bracketleft")
+screen.onkey(lambda: jump(lambda: timeline.seek_seconds(60)), "bracketright")
+if player is not None:  # replaying: the keys drive the playback instead
+    screen.onkey(player.toggle_pause, "space")
+    screen.onkey(lambda: player.set_speed(player.speed * 2), "+")
+    screen.onkey(lambda: player.set_speed(player.speed * 2), "=")
+    screen.onkey(lambda: player.set_speed(player.speed / 2), "-")
+    screen.onkey(lambda: player.seek(player.t - 10), "bracketleft")
+    screen.onkey(lambda: player.seek(player.t + 10), "bracketright")
+
+# Physics runs at a fixed 20 ms step; rendering interpolates in between
+clock = FixedStepClock(step=MINI_SCENE["step"], max_steps=5)
+TARGET_FPS = 60
+scheduler = FrameScheduler(TARGET_FPS)  # frames on absolute deadlines
+frame_timer = PhaseTimer(target_ms=1000 / TARGET_FPS)  # per-phase frame timings
+hud = StatsHUD(screen, frame_timer)       # live overlay, toggled with [H]
+
+# Snapshots: engine arrays + the speed factor
+def capture_state():
+    return {**nest("engine", engine.get_state()), "speed_scale": state["speed_scale"]}
+
+def restore_state(saved):
+    engine.set_state(section(saved, "engine"))
+    state["speed_scale"] = saved["speed_scale"]
+
+def advance_headless(n):
+    for _ in range(n):
+        engine.step(state["speed_scale"])
+
+timeline = Timeline(clock, capture_state, restore_state, advance_headless,
+                    path="snapshot_solar.bin", every=1500)  # checkpoint every 30 s
+
+def jump(action):
+    """Run a load/seek, then move the bodies without drawing a trail across the gap."""
+    action()
+    engine.evaluate(alpha=1.0)
+    for body in planets + moons:
+        body.t.penup()
+        body.t.goto(engine.x[body.index], engine.y[body.index])
+        body.t.clear()
 
 def animate():
-    if not state["paused"]:
+    frame_timer.begin()
+    moved = False
+    if player is not None:
+        frame = player.poll(replay_event)
+        if frame is not None:
+            engine.x, engine.y = frame.x, frame.y  # the bodies read these
+            moved = True
+    elif state["paused"]:
+        clock.reset()
+    else:
+        for _ in range(clock.advance()):
+            engine.step(state["speed_scale"])
+        timeline.record()
+        engine.evaluate(alpha=clock.alpha)
+        if recorder is not None:
+            recorder.frame(engine.x, engine.y)
+        moved = True
+    frame_timer.lap("physics")
+    if moved and scheduler.render:  # skipped while catching up
         for p in planets:
-            p.move(speed_scale=state["speed_scale"])
+            p.move()
+        for m in moons:
+            m.move()
+        frame_timer.lap("bodies")
         for m in moons:
-            # keep moon orbit guide around current parent if visible
-            if state["show_orbits"]:
-                m.toggle_orbit(True)
-            m.move(speed_scale=state["speed_scale"])
-    screen.update()
-    screen.ontimer(animate, 20)  # ~50 FPS
+            m.follow_parent()  # keep the moon orbit guide around its planet
+        frame_timer.lap("orbits")
+        for body in planets + moons:
+            body.draw_label()
+        frame_timer.lap("labels")
+    hud.update()
+    frame_timer.lap("hud")
+    if scheduler.render:
+        screen.update()
+    frame_timer.lap("update")
+    frame_timer.end()
+    screen.ontimer(animate, scheduler.frame_done())  # next deadline
 
 animate()
 
@@ -0,0 +1,99 @@
+"""
+Spatial Index
+-------------
+Uniform-grid index over body positions for picking (clicks and hover),
+plus view culling and label de-cluttering.
+
+Scanning every body and asking each turtle for its position is O(N) per
+event, which lags with thousands of asteroids and moons. `GridIndex`
+buckets the current position arrays into square cells with one NumPy
+sort; a query only looks at the few cells around the pointer.
+
+- `rebuild(xs, ys, radii)` takes the whole frame at once (O(N log N))
+- `nearest(x, y)` is size-aware: a body is hit when the pointer is within
+  its drawn radius plus a small slop; the closest surface wins
+- `visible_mask()` culls bodies outside the view rectangle
+- `suppress_overlaps()` keeps label boxes greedily in priority order and
+  drops any that overlap one already kept, using a hash of grid cells so
+  each box is only tested against its neighbours
+"""
+import numpy as np
+
+_OFFSET = 1 << 20  # cell coordinates are shifted to be non-negative
+_STRIDE = 1 << 21
+
+
+class GridIndex:
+    def __init__(self, cell=32.0):
+        self.cell = float(cell)
+        self.xs = self.ys = self.radii = np.zeros(0)
+        self._keys = np.zeros(0, dtype=np.int64)    # sorted cell keys
+        self._order = np.zeros(0, dtype=np.intp)    # body index per sorted key
+        self._max_radius = 0.0
+
+    def __len__(self):
+        return len(self.xs)
+
+    def _cells(self, xs, ys):
+        ix = np.floor_divide(xs, self.cell).astype(np.int64) + _OFFSET
+        iy = np.floor_divide(ys, self.cell).astype(np.int64) + _OFFSET
+        return ix * _STRIDE + iy
+
+    def rebuild(self, xs, ys, radii):
+        """Index bodies at (xs, ys) drawn with the given radii (scalar or array)."""
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=float), self.xs.shape)
+        self._max_radius = float(self.radii.max()) if len(self.xs) else 0.0
+        keys = self._cells(self.xs, self.ys)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def candidates(self, x, y, reach):
+        """Indices of bodies in the cells overlapping the square x±reach, y±reach."""
+        x0, x1 = np.floor_divide([x - reach, x + reach], self.cell).astype(np.int64)
+        y0, y1 = np.floor_divide([y - reach, y + reach], self.cell).astype(np.int64)
+        found = []
+        for ix in range(x0, x1 + 1):
+            # cells with the same ix and consecutive iy are contiguous in key order
+            lo = (ix + _OFFSET) * _STRIDE + y0 + _OFFSET
+            hi = (ix + _OFFSET) * _STRIDE + y1 + _OFFSET
+            a = np.searchsorted(self._keys, lo, side="left")
+            b = np.searchsorted(self._keys, hi, side="right")
+            if b > a:
+                found.append(self._order[a:b])
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.intp)
+
+    def nearest(self, x, y, slop=3.0):
+        """Index of the body under (x, y), or -1 if none is close enough."""
+        if not len(self.xs):
+            return -1
+        idx = self.candidates(x, y, self._max_radius + slop)
+        if not len(idx):
+            return -1
+        gap = np.hypot(self.xs[idx] - x, self.ys[idx] - y) - self.radii[idx]
+        k = int(np.argmin(gap))
+        return int(idx[k]) if gap[k] <= slop else -1
+
+
+def visible_mask(xs, ys, radii, half_w, half_h, margin=2.0):
+    """True for bodies that overlap the view [-half_w, half_w] x [-half_h, half_h]."""
+    reach = np.asarray(radii, dtype=float) + margin
+    return (np.abs(xs) <= half_w + reach) & (np.abs(ys) <= half_h + reach)
+
+
+def suppress_overlaps(x0, y0, x1, y1, cell=64.0):
+    """Mask of boxes to keep; earlier boxes win. Boxes are (x0, y0)-(x1, y1)."""
+    keep = np.zeros(len(x0), dtype=bool)
+    buckets = {}  # (cx, cy) -> indices of kept boxes touching that cell
+    for i in range(len(x0)):
+        cells = [(cx, cy)
+                 for cx in range(int(x0[i] // cell), int(x1[i] // cell) + 1)
+                 for cy in range(int(y0[i] // cell), int(y1[i] // cell) + 1)]
+        if any(x0[i] < x1[j] and x0[j] < x1[i] and y0[i] < y1[j] and y0[j] < y1[i]
+               for c in cells for j in buckets.get(c, ())):
+            continue
+        keep[i] = True
+        for c in cells:
+            buckets.setdefault(c, []).append(i)
+    return keep
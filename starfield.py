@@ -0,0 +1,130 @@
+"""
+Star Field
+----------
+Pre-baked star backgrounds.
+
+Instead of thousands of turtle `goto` + `dot` calls at startup, the stars
+are rasterized once into a PNG (keyed on seed, count, size and dot sizes)
+and cached on disk. Drawing the background is then a single canvas image
+item, so startup time does not grow with the number of stars.
+"""
+import os
+import tkinter as tk
+
+import numpy as np
+
+from raster import draw_dots, new_image, write_png
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".star_cache")
+
+_images = []  # keep PhotoImages alive (Tk drops images without a reference)
+
+
+def star_field_path(width, height, count, seed, sizes):
+    sizes_key = "-".join(str(s) for s in sizes)
+    name = f"stars_{seed}_{count}_{width}x{height}_{sizes_key}.png"
+    return os.path.join(CACHE_DIR, name)
+
+
+def render_star_field(width, height, count, seed=0, sizes=(1, 2, 3)):
+    """Rasterize the star field into an RGB array (height, width, 3)."""
+    rng = np.random.default_rng(seed)
+    px = rng.integers(0, width, count)
+    py = rng.integers(0, height, count)
+    size = rng.choice(np.asarray(sizes), count)
+    img = new_image(width, height)
+    for s in np.unique(size):
+        pick = size == s
+        draw_dots(img, px[pick], py[pick], s)
+    return img
+
+
+def bake_star_field(width, height, count, seed=0, sizes=(1, 2, 3)):
+    """Return the path of the cached star image, rendering it if needed."""
+    path = star_field_path(width, height, count, seed, sizes)
+    if os.path.exists(path):
+        return path
+
+    img = render_star_field(width, height, count, seed, sizes)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    write_png(tmp, img)
+    os.replace(tmp, path)  # never leave a half-written cache file
+    return path
+
+
+def draw_star_field(screen, count, width, height, seed=0, sizes=(1, 2, 3)):
+    """Blit the cached star field as one image item centred on (0, 0)."""
+    cv = screen.getcanvas()
+    image = tk.PhotoImage(file=bake_star_field(width, height, count, seed, sizes),
+                          master=cv)
+    _images.append(image)
+    item = cv.create_image(0, 0, image=image, anchor="center")
+    cv.tag_lower(item)
+    return item
+
+
+# ---------- Drifting stars ----------
+# (speed factor, dot size, colour) per depth layer, far to near
+FLAT_LAYERS = ((1.0, 2, "white"),)
+PARALLAX_LAYERS = ((0.3, 1, "#666666"), (0.6, 1, "#aaaaaa"),
+                   (1.0, 2, "white"), (1.8, 3, "white"))
+
+
+class DriftingStars:
+    """Persistent star items drifting left, one batched canvas move per layer.
+
+    Stars that cross the left edge wrap to the right edge with a new
+    random height; only those stars get their coordinates rewritten.
+    """
+
+    def __init__(self, screen, count, width, height, layers=FLAT_LAYERS,
+                 margin=20, seed=None):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.count = count
+        self.half_w = width / 2 + margin
+        self.half_h = height / 2
+        self.rng = np.random.default_rng(seed)
+        self.tag = f"stars{id(self)}"
+        self.set_layers(layers)
+
+    def set_layers(self, layers):
+        """(Re)build the star items for the given depth layers."""
+        self.cv.delete(self.tag)
+        self.layers = layers
+        self.x = self.rng.uniform(-self.half_w, self.half_w, self.count)
+        self.y = self.rng.uniform(-self.half_h, self.half_h, self.count)
+        self.layer = self.rng.integers(0, len(layers), self.count)
+        self.factor = np.asarray([l[0] for l in layers])[self.layer]
+        self.items = np.empty(self.count, dtype=int)
+        for k, (_, size, color) in enumerate(layers):
+            for i in np.flatnonzero(self.layer == k):
+                self.items[i] = self.cv.create_oval(
+                    *self._box(i), fill=color, outline=color,
+                    tags=(self.tag, self._layer_tag(k)))
+        self.cv.tag_lower(self.tag)
+
+    def _layer_tag(self, k):
+        return f"{self.tag}_L{k}"
+
+    def _box(self, i):
+        r = self.layers[self.layer[i]][1] / 2.0
+        cx = self.x[i] * self.screen.xscale
+        cy = -self.y[i] * self.screen.yscale
+        return cx - r, cy - r, cx + r, cy + r
+
+    def drift(self, dx):
+        """Move every star left by dx (scaled per layer) and wrap the edge."""
+        if not dx:
+            return
+        for k, (factor, _, _) in enumerate(self.layers):
+            self.cv.move(self._layer_tag(k), -dx * factor * self.screen.xscale, 0)
+        self.x -= dx * self.factor
+
+        wrapped = np.flatnonzero(self.x < -self.half_w)
+        if len(wrapped):
+            self.x[wrapped] += 2 * self.half_w
+            self.y[wrapped] = self.rng.uniform(-self.half_h, self.half_h, len(wrapped))
+            for i in wrapped:
+                self.cv.coords(int(self.items[i]), *self._box(i))
@@ -0,0 +1,66 @@
+"""
+Trails
+------
+Ring-buffer trails drawn with a fixed pool of canvas dots.
+
+Every trail owns `length` oval items created once (hidden). Pushing a
+new point overwrites the oldest slot of the ring buffer and moves that
+one item, so a frame costs O(1) canvas calls per body no matter how long
+the trail is. Nothing is created or deleted while the simulation runs.
+"""
+import itertools
+
+import numpy as np
+
+_trail_ids = itertools.count()
+
+
+class Trail:
+    def __init__(self, screen, length, color, size=2):
+        self.screen = screen
+        self.cv = screen.getcanvas()
+        self.length = length
+        self.size = size
+        self.points = np.zeros((length, 2))
+        self.head = 0    # next slot to overwrite (the oldest point)
+        self.count = 0   # filled slots
+        self.tag = f"trail{next(_trail_ids)}"
+        self.items = [self.cv.create_oval(0, 0, 0, 0, fill=color, outline=color,
+                                          state="hidden", tags=(self.tag,))
+                      for _ in range(length)]
+
+    def _place(self, item, x, y, size):
+        r = size / 2.0
+        cx, cy = x * self.screen.xscale, -y * self.screen.yscale
+        self.cv.coords(item, cx - r, cy - r, cx + r, cy + r)
+
+    def push(self, x, y):
+        slot = self.head
+        self.points[slot] = x, y
+        self._place(self.items[slot], x, y, self.size)
+        if self.count < self.length:
+            self.count += 1
+            self.cv.itemconfigure(self.items[slot], state="normal")
+        self.head = (slot + 1) % self.length
+
+    def clear(self):
+        if self.count:
+            self.count = 0
+            self.head = 0
+            self.cv.itemconfigure(self.tag, state="hidden")
+
+    def get_state(self):
+        return {"points": self.points.copy(), "head": self.head, "count": self.count}
+
+    def set_state(self, state):
+        """Restore a get_state() copy and re-place the dots."""
+        self.clear()
+        self.points[:] = state["points"]
+        self.head = int(state["head"])
+        self.count = int(state["count"])
+        self._redraw()
+
+    def _redraw(self):
+        for slot in range(self.count):
+            self._place(self.items[slot], *self.points[slot], self.size)
+            self.cv.itemconfigure(self.items[slot], state="normal")
@@ -0,0 +1,150 @@
+"""
+Physics Worker
+--------------
+Run a simulation in another process and share its positions through a
+`multiprocessing.shared_memory` double buffer.
+
+The Tk loop never waits for physics: the worker steps the simulation at
+its own pace and publishes each finished frame into the slot the reader
+is not using; the reader copies whichever slot was completed last.
+
+- a simulation is any picklable object with `step(dt)` and `pos`, an
+  (n, 2) float array (e.g. nbody.NBodySystem, kepler.KeplerMotion); if
+  it also has `vel`, the velocities are published with the positions so
+  the caller can take the state back (`latest_state()`) when it stops
+- each slot has a sequence number that is odd while it is being written,
+  so a reader never returns a half-written frame (a seqlock)
+- speed, pause and stop are plain floats in the same shared block
+- the worker is a fresh interpreter running this file, so the GUI script
+  is never re-imported (no second window) and Tk is never forked
+
+Shared block layout (float64 unless noted):
+
+    int64 seq[2], int64 latest, int64 frames   # 32 bytes
+    speed, paused, stop, sim_time              # 32 bytes
+    slots[2, n, 2 or 4]                        # x, y[, vx, vy]
+"""
+import atexit
+import os
+import pickle
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER_BYTES = 64
+
+
+def _views(buf, n, cols):
+    ints = np.ndarray((4,), dtype=np.int64, buffer=buf)
+    control = np.ndarray((4,), dtype=np.float64, buffer=buf, offset=32)
+    slots = np.ndarray((2, n, cols), dtype=np.float64, buffer=buf, offset=HEADER_BYTES)
+    return ints, control, slots
+
+
+class SimulationWorker:
+    def __init__(self, sim, dt):
+        self.sim = sim   # the caller's copy; the worker steps a pickled one
+        self.n = len(sim.pos)
+        self.cols = 4 if hasattr(sim, "vel") else 2
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=HEADER_BYTES + 2 * self.n * self.cols * 8)
+        self.ints, self.control, self.slots = _views(self.shm.buf, self.n, self.cols)
+        self.ints[:] = (0, 0, 0, 0)
+        self.control[:] = (1.0, 0.0, 0.0, 0.0)
+        self.slots[:, :, :2] = np.asarray(sim.pos, dtype=float)
+        if self.cols == 4:
+            self.slots[:, :, 2:] = np.asarray(sim.vel, dtype=float)
+        self.proc = subprocess.Popen([sys.executable, os.path.abspath(__file__)],
+                                     stdin=subprocess.PIPE)
+        self.proc.stdin.write(pickle.dumps((self.shm.name, self.n, self.cols, sim, dt)))
+        self.proc.stdin.close()
+        atexit.register(self.stop)
+
+    def set_controls(self, speed=1.0, paused=False):
+        self.control[0] = speed
+        self.control[1] = 1.0 if paused else 0.0
+
+    @property
+    def frames(self):
+        """Number of frames the worker has published."""
+        return int(self.ints[3])
+
+    @property
+    def sim_time(self):
+        return float(self.control[3])
+
+    def latest_state(self):
+        """Copy of the last completed slot, (n, 2) or (n, 4), or None."""
+        if self.shm is None:
+            return None
+        for _ in range(3):
+            slot = int(self.ints[2])
+            seq = self.ints[slot]
+            if seq % 2:
+                continue  # being written (the worker lapped us); retry
+            state = self.slots[slot].copy()
+            if self.ints[slot] == seq:
+                return state
+        return None
+
+    def latest(self, default=None):
+        """Copy of the last completed positions, or `default` if none is readable."""
+        state = self.latest_state()
+        return default if state is None else state[:, :2]
+
+    def stop(self, timeout=1.0):
+        if self.shm is None:
+            return
+        self.control[2] = 1.0
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        # drop the numpy views before the buffer they point into
+        self.ints = self.control = self.slots = None
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+        atexit.unregister(self.stop)
+
+
+def _serve(name, n, cols, sim, dt):
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        # the parent owns (and unlinks) the block; don't let this process's
+        # resource tracker remove it too
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    ints, control, slots = _views(shm.buf, n, cols)
+    parent = os.getppid()
+    next_tick = time.perf_counter()
+    try:
+        while control[2] == 0.0 and os.getppid() == parent:
+            if control[1]:
+                time.sleep(dt)
+                next_tick = time.perf_counter()
+                continue
+            sim.step(dt * control[0])
+            control[3] += dt * control[0]
+            slot = 1 - int(ints[2])
+            ints[slot] += 1          # odd: slot is being written
+            slots[slot, :, :2] = sim.pos
+            if cols == 4:
+                slots[slot, :, 2:] = sim.vel
+            ints[slot] += 1          # even: slot is complete
+            ints[2] = slot
+            ints[3] += 1
+            # real-time pacing; if the step is slower than dt, just run flat out
+            next_tick = max(next_tick + dt, time.perf_counter() - dt)
+            time.sleep(max(next_tick - time.perf_counter(), 0.0))
+    finally:
+        del ints, control, slots
+        shm.close()
+
+
+if __name__ == "__main__":
+    _serve(*pickle.loads(sys.stdin.buffer.read()))